@@ -3,16 +3,19 @@
 # Architecture: pre-compute all country scores at startup; dashboard/countries/anomalies read from cache; only GPT-4o briefs on-demand.
 
 import asyncio
+import itertools
 import json
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
 
-import pandas as pd
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 load_dotenv()
@@ -20,13 +23,31 @@ load_dotenv()
 from backend.ml.pipeline import (
     FEATURE_COLUMNS,
     MONITORED_COUNTRIES,
-    SentinelFeaturePipeline,
+    compute_features_chunk,
+    feature_cache,
+    with_sentiment,
+)
+from backend.ml.risk_scorer import predict_risk
+from backend.ml.sentiment import load_finbert, sentiment_batcher, sentiment_cache
+from backend.ml.refresh import (
+    ScoreSnapshot,
+    base_features,
+    build_dashboard_summary,
+    chunk_codes,
+    create_pools,
+    load_snapshot,
+    refresh_time_budget,
+    refresh_workers,
+    save_snapshot,
+    score_countries,
 )
-from backend.ml.risk_scorer import predict_risk, level_from_score
-from backend.ml.anomaly import detect_anomaly
-from backend.ml.sentiment import load_finbert, analyze_headlines_sentiment
-from backend.ml.forecaster import forecast_risk, SEQUENCE_FEATURES
 from backend.ml.tracker import PredictionTracker
+from backend.ml.feature_store import FeatureStore, feature_store_dir, prune_feature_stores
+from backend.ml.registry import registry
+from backend.ml.sources import dataframe_cache
+from backend.ml.data.fetch_news import headline_fetcher
+from backend.ml.briefs import BriefStore, headlines_hash, score_bucket
+from backend.ml.warmup import model_warmup, start_warmup
 
 ROOT = Path(__file__).resolve().parents[1]
 MODEL_VERSION = "2.0.0"
@@ -48,77 +69,36 @@ class ForecastRequest(BaseModel):
 
 
 # --- Pre-computed caches (filled at startup, refreshed every 15 min) ---
-_country_scores: dict = {}  # code -> {riskScore, riskLevel, isAnomaly, anomalyScore, severity, features, computedAt, name, risk_prediction, anomaly}
-_dashboard_summary: dict = {}  # full dashboard summary JSON
-_previous_summary: dict = {}  # for delta computation (globalThreatIndex, highPlusCountries)
+# _snapshot.scores: code -> {riskScore, riskLevel, isAnomaly, anomalyScore, severity, computedAt, name, risk_prediction, anomaly, forecast}
+# _snapshot.features: FeatureStore with every country's feature row (features_for(code) for a dict).
+# _snapshot.summary: full dashboard summary JSON. Replaced wholesale (one reference swap) per refresh; never mutated.
+_snapshot: ScoreSnapshot | None = None
+_snapshot_versions = itertools.count(1)
 
-# Legacy cache for /api/analyze brief responses (optional; analyze now uses _country_scores + GPT-4o on-demand)
+# Legacy cache for /api/analyze brief responses (optional; analyze now uses _snapshot + GPT-4o on-demand)
 _cache: dict = {}
 _cache_ttl: dict = {}
 CACHE_TTL_SECONDS = 900
 
 
+def _current_snapshot() -> ScoreSnapshot:
+    """Current published snapshot (lock-free read of one reference); 503 until the first refresh finishes."""
+    snapshot = _snapshot
+    if snapshot is None:
+        raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
+    return snapshot
+
+
 def is_cache_valid(country_code: str) -> bool:
     if country_code not in _cache_ttl:
         return False
     return (datetime.utcnow() - _cache_ttl[country_code]).total_seconds() < CACHE_TTL_SECONDS
 
 
-# --- Data loading ---
-def load_gdelt_cache(country_code: str) -> pd.DataFrame:
-    path = ROOT / "data" / "gdelt" / f"{country_code}_events.csv"
-    return pd.read_csv(path) if path.exists() else pd.DataFrame()
-
-
-def load_acled_cache(country: str) -> pd.DataFrame:
-    safe = country.lower().replace(" ", "_")
-    path = ROOT / "data" / "acled" / f"{safe}.csv"
-    return pd.read_csv(path) if path.exists() else pd.DataFrame()
-
-
-def load_ucdp_cache(country: str) -> pd.DataFrame:
-    safe = country.lower().replace(" ", "_")
-    path = ROOT / "data" / "ucdp" / f"{safe}_ged.csv"
-    if not path.exists():
-        ucdp_dir = ROOT / "data" / "ucdp"
-        if ucdp_dir.exists():
-            alts = list(ucdp_dir.glob(f"*{safe}*ged*.csv"))
-            path = alts[0] if alts else None
-    return pd.read_csv(path) if path and path.exists() else pd.DataFrame()
-
-
-def load_wb_cache(country_code: str) -> dict:
-    info = MONITORED_COUNTRIES.get(country_code.upper(), {})
-    iso3 = info.get("iso3", country_code)
-    path = ROOT / "data" / "world_bank" / f"{iso3}.json"
-    if path.exists():
-        with open(path, encoding="utf-8") as f:
-            return json.load(f).get("features", {})
-    return {}
-
-
 # --- Headlines (NewsAPI) ---
 async def fetch_headlines(country: str, max_headlines: int = 10) -> list[str]:
-    api_key = os.getenv("NEWS_API")
-    if not api_key:
-        return []
-    try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                "https://newsapi.org/v2/everything",
-                params={
-                    "q": country,
-                    "sortBy": "publishedAt",
-                    "pageSize": max_headlines,
-                    "apiKey": api_key,
-                },
-                timeout=10,
-            )
-            data = resp.json()
-            return [a["title"] for a in data.get("articles", []) if a.get("title")]
-    except Exception:
-        return []
+    """Shared, cached and coalesced NewsAPI lookup (see ml/data/fetch_news.py)."""
+    return await headline_fetcher.fetch(country, max_headlines)
 
 
 # --- GPT-4o ---
@@ -153,12 +133,22 @@ Return ONLY valid JSON. No markdown, no backticks, no explanation outside the JS
 """
 
 
+_openai_client = None  # one AsyncOpenAI (and its connection pool) for the process
+
+
+def _get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI
+        _openai_client = AsyncOpenAI()
+    return _openai_client
+
+
 async def call_gpt4o(ml_context: str, country: str, risk_prediction: dict) -> dict | None:
     if not os.getenv("OPENAI_API_KEY"):
         return None
     try:
-        from openai import AsyncOpenAI
-        client = AsyncOpenAI()
+        client = _get_openai_client()
         response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
@@ -176,141 +166,223 @@ async def call_gpt4o(ml_context: str, country: str, risk_prediction: dict) -> di
         return None
 
 
-def _anomaly_input_from_features(features: dict) -> dict:
-    """Map pipeline feature names to ANOMALY_FEATURES keys."""
-    return {
-        "goldstein_mean": features.get("gdelt_goldstein_mean", 0),
-        "goldstein_std": features.get("gdelt_goldstein_std", 0),
-        "goldstein_min": features.get("gdelt_goldstein_min", 0),
-        "mentions_total": features.get("gdelt_event_count", 0),
-        "avg_tone": features.get("gdelt_avg_tone", 0),
-        "event_count": features.get("gdelt_event_count", 0),
-    }
-
-
-def _build_forecast_sequence(features: dict) -> "np.ndarray":
-    """Build (90, 12) array from pipeline features for LSTM (repeat current row 90 times)."""
-    import numpy as np
-    risk = min(100.0, max(0.0, float(features.get("political_risk_score", features.get("conflict_composite", 0)))))
-    row = [
-        risk,
-        float(features.get("gdelt_goldstein_mean", 0)),
-        float(features.get("gdelt_event_count", 0)),
-        float(features.get("acled_fatalities_30d", 0)),
-        float(features.get("acled_battle_count", 0)),
-        float(features.get("finbert_negative_score", 0)),
-        float(features.get("wb_gdp_growth_latest", 0)),
-        float(features.get("anomaly_score", 0)),
-        float(features.get("gdelt_avg_tone", 0)),
-        float(features.get("gdelt_event_acceleration", 0)),
-        float(features.get("ucdp_conflict_intensity", 0)),
-        float(features.get("econ_composite_score", 0)),
-    ]
-    return np.array([row] * 90, dtype=np.float32)
-
+# Worker pools for the refresh (created on first use; see backend/ml/refresh.py)
+_feature_pool: ProcessPoolExecutor | None = None
+_scoring_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pools() -> tuple[ProcessPoolExecutor, ProcessPoolExecutor]:
+    global _feature_pool, _scoring_pool
+    if _feature_pool is None or _scoring_pool is None:
+        _feature_pool, _scoring_pool = create_pools()
+    return _feature_pool, _scoring_pool
+
+
+def _shutdown_pools() -> None:
+    global _feature_pool, _scoring_pool
+    for pool in (_feature_pool, _scoring_pool):
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    _feature_pool = _scoring_pool = None
+
+
+# Feature chunks that overran the refresh budget keep running; the next refresh merges what they computed
+_late_chunks: dict[asyncio.Future, list[str]] = {}
+
+
+async def _compute_all_features(
+    loop: asyncio.AbstractEventLoop,
+    feature_pool: ProcessPoolExecutor,
+    codes: list[str],
+    previous: ScoreSnapshot | None,
+) -> tuple[dict[str, dict], dict[str, dict], set[str], list[str]]:
+    """
+    Fan feature computation out over the pool in chunks. Each worker holds one country's raw frames
+    at a time, so peak memory is bounded by worker count, not country count.
+    Workers fingerprint every country's input files and recompute features only where they changed
+    since `previous`; unchanged countries reuse the previous snapshot's features.
+    With a previous snapshot, chunks still running after the time budget are carried forward from it.
+    They are not discarded: their results are merged into the next refresh (a worker only re-stats the
+    files they were computed from), countries still being computed are not resubmitted, and countries
+    carried last time are scheduled first. The first refresh always waits for every chunk.
+    Returns ({code: features}, {code: input fingerprints}, changed_codes, carried_forward_codes).
+    """
+    previous_scores = previous.scores if previous is not None else {}
+    late_results: dict[str, tuple[dict, dict]] = {}  # code -> (inputs, features) from last refresh's late chunks
+    running: set[str] = set()
+    for fut, chunk in list(_late_chunks.items()):
+        if not fut.done():
+            running.update(code for code in chunk if code in previous_scores)
+            continue
+        del _late_chunks[fut]
+        if fut.cancelled() or fut.exception() is not None:
+            continue
+        part = fut.result()
+        for code, features in part["features"].items():
+            late_results[code] = (part["inputs"][code], features)
+
+    stale_first = sorted(codes, key=lambda code: not previous_scores.get(code, {}).get("stale"))
+    chunk_futures = {}
+    for chunk in chunk_codes([code for code in stale_first if code not in running], refresh_workers() * 4):
+        previous_inputs = {
+            code: late_results[code][0] if code in late_results else previous_scores[code].get("inputs")
+            for code in chunk
+            if code in late_results or code in previous_scores
+        }
+        chunk_futures[loop.run_in_executor(feature_pool, compute_features_chunk, chunk, previous_inputs)] = chunk
+    all_features: dict[str, dict] = {}
+    inputs: dict[str, dict] = {}
+    changed: set[str] = set()
+    carried: list[str] = []
+
+    def carry(chunk: list[str]) -> None:
+        for code in chunk:
+            all_features[code] = base_features(previous.features_for(code))
+            inputs[code] = previous_scores[code].get("inputs")
+        carried.extend(chunk)
+
+    carry([code for code in codes if code in running])  # still computing since an earlier refresh
+    if not chunk_futures:
+        return all_features, inputs, changed, carried
+    done, pending = await asyncio.wait(
+        chunk_futures, timeout=refresh_time_budget() if previous is not None else None
+    )
+    for fut in pending:
+        chunk = chunk_futures[fut]
+        if all(code in previous_scores for code in chunk):
+            carry(chunk)
+            _late_chunks[fut] = chunk
+            fut.add_done_callback(lambda f: f.cancelled() or f.exception())  # retrieve errors; result read next refresh
+        else:
+            done.add(fut)
+    for fut in done:
+        part = await fut
+        inputs.update(part["inputs"])
+        all_features.update(part["features"])
+        changed.update(part["features"])
+        for code in part["unchanged"]:
+            if code in late_results:
+                # Computed by a late chunk against the same files: new to the snapshot, so it is rescored
+                all_features[code] = late_results[code][1]
+                changed.add(code)
+            else:
+                all_features[code] = base_features(previous.features_for(code))
+    return all_features, inputs, changed, carried
 
-# Only precompute this many countries so startup finishes in seconds, not minutes.
-DASHBOARD_COUNTRY_LIMIT = 15
 
 async def precompute_all_scores() -> None:
-    """Pre-compute ML scores for a limited set of countries; fill _country_scores and _dashboard_summary."""
-    global _country_scores, _dashboard_summary, _previous_summary
+    """
+    Pre-compute ML scores for every monitored country and publish them as a new ScoreSnapshot.
+    Features fan out across the feature worker pool and scoring runs in the scoring worker,
+    so the event loop only awaits results and keeps serving requests. Per-stage timings go to
+    the snapshot metadata (see /health) and the log.
+    """
+    global _snapshot
     t0 = time.perf_counter()
-    _country_scores.clear()
-    all_features = SentinelFeaturePipeline.compute_all_countries(limit=DASHBOARD_COUNTRY_LIMIT)
-    # Iterate only over countries we actually computed
-    items = list(MONITORED_COUNTRIES.items())[:DASHBOARD_COUNTRY_LIMIT]
-    country_rows = []
-
-    for code, info in items:
-        features = all_features.get(code, {})
-        try:
-            pred = predict_risk(features)
-            risk_score = pred["risk_score"]
-            risk_level = pred["risk_level"]
-        except FileNotFoundError:
-            risk_score = 0
-            risk_level = "LOW"
-            pred = {
-                "risk_level": risk_level,
-                "risk_score": risk_score,
-                "confidence": 0.5,
-                "probabilities": {},
-                "top_drivers": [],
-            }
-
-        anomaly_input = _anomaly_input_from_features(features)
-        anomaly = detect_anomaly(code, anomaly_input)
-        features["anomaly_score"] = anomaly["anomaly_score"]
-
-        if anomaly["is_anomaly"]:
-            risk_score = min(100, risk_score + int(anomaly["anomaly_score"] * 15))
-            risk_level = level_from_score(risk_score)
-            pred = dict(pred, risk_score=risk_score, risk_level=risk_level)
-
-        computed_at = datetime.utcnow().isoformat() + "Z"
-        _country_scores[code] = {
-            "riskScore": risk_score,
-            "riskLevel": risk_level,
-            "isAnomaly": anomaly["is_anomaly"],
-            "anomalyScore": anomaly["anomaly_score"],
-            "severity": anomaly["severity"],
-            "features": features,
-            "computedAt": computed_at,
-            "name": info["name"],
-            "risk_prediction": pred,
-            "anomaly": anomaly,
-        }
-        country_rows.append({
-            "code": code,
-            "name": info["name"],
-            "riskScore": risk_score,
-            "riskLevel": risk_level,
-            "isAnomaly": anomaly["is_anomaly"],
-            "anomalyScore": anomaly["anomaly_score"],
-        })
-
-    risk_scores = [r["riskScore"] for r in country_rows]
-    global_threat_index = round(sum(risk_scores) / len(risk_scores)) if risk_scores else 0
-    prev_gti = _previous_summary.get("globalThreatIndex", global_threat_index)
-    global_threat_index_delta = global_threat_index - prev_gti
+    loop = asyncio.get_running_loop()
+    feature_pool, scoring_pool = _get_pools()
+    previous = _snapshot
+    items = [(code, info["name"]) for code, info in MONITORED_COUNTRIES.items()]
+    timings = {}
+    try:
+        t_stage = time.perf_counter()
+        all_features, inputs, changed, carried = await _compute_all_features(
+            loop, feature_pool, [code for code, _ in items], previous
+        )
+        timings["features"] = time.perf_counter() - t_stage
+        # Hand the scoring worker a memory-mappable float32 matrix instead of pickled feature dicts
+        version = next(_snapshot_versions)
+        store = FeatureStore.from_features(all_features, codes=[code for code, _ in items])
+        store_dir = feature_store_dir(version)
+        await asyncio.to_thread(store.save, store_dir)
+        scores, scoring_timings, scoring_models = await loop.run_in_executor(
+            scoring_pool,
+            score_countries,
+            items,
+            store_dir,
+            inputs,
+            dict(previous.scores) if previous is not None else None,
+            changed,
+        )
+        timings.update(scoring_timings)
+    except BrokenProcessPool:
+        _shutdown_pools()  # recreated on the next refresh
+        raise
+
+    # Carried-forward countries are flagged with when their features were last fresh; the flag clears once recomputed
+    carried_set = set(carried)
+    for code, entry in scores.items():
+        if code in carried_set:
+            scores[code] = dict(entry, stale=True, staleSince=entry.get("staleSince") or previous.computed_at)
+        elif "stale" in entry:
+            scores[code] = {k: v for k, v in entry.items() if k not in ("stale", "staleSince")}
+
+    rescored = [
+        code for code, c in scores.items()
+        if previous is None or previous.scores.get(code, {}).get("computedAt") != c["computedAt"]
+    ]
 
-    active_anomalies = sum(1 for r in country_rows if r["isAnomaly"])
-    high_plus_countries = sum(1 for r in country_rows if r["riskLevel"] in ("HIGH", "CRITICAL"))
-    prev_high = _previous_summary.get("highPlusCountries", high_plus_countries)
-    high_plus_delta = high_plus_countries - prev_high
+    # Published store carries each country's anomaly score (carried-forward entries keep theirs)
+    store = store.with_column("anomaly_score", [scores[code]["anomalyScore"] for code in store.codes])
+    await asyncio.to_thread(store.save, store_dir)
+    store = FeatureStore.load(store_dir)
+    tracker.log_snapshot(scores, store, MODEL_VERSION)  # queued; one transaction on the writer thread
+    tracker.request_compaction()  # folds expired raw rows into rollups, a period at a time
 
-    escalation_alerts_24h = sum(1 for r in country_rows if r["anomalyScore"] > 0.5)
-    accuracy_result = tracker.compute_accuracy(days_back=90)
+    t_stage = time.perf_counter()
+    accuracy_result = await asyncio.to_thread(tracker.compute_accuracy, 90)
     model_health = round(accuracy_result["accuracy_pct"], 1)
-
-    countries_sorted = sorted(country_rows, key=lambda r: r["riskScore"], reverse=True)
-    computed_at = datetime.utcnow().isoformat() + "Z"
-
-    _dashboard_summary = {
-        "globalThreatIndex": global_threat_index,
-        "globalThreatIndexDelta": global_threat_index_delta,
-        "activeAnomalies": active_anomalies,
-        "highPlusCountries": high_plus_countries,
-        "highPlusCountriesDelta": high_plus_delta,
-        "escalationAlerts24h": escalation_alerts_24h,
-        "modelHealth": model_health,
-        "countries": countries_sorted,
-        "computedAt": computed_at,
-    }
-    _previous_summary["globalThreatIndex"] = global_threat_index
-    _previous_summary["highPlusCountries"] = high_plus_countries
-
+    # Deltas (globalThreatIndex, highPlusCountries) are against the snapshot this refresh replaces
+    summary = build_dashboard_summary(scores, previous.summary if previous else {}, model_health)
+    timings["summary"] = time.perf_counter() - t_stage
     elapsed = time.perf_counter() - t0
-    n = len(country_rows)
-    print(f"Pre-computed {n} countries in {elapsed:.1f}s")
+    timings["total"] = elapsed
+    snapshot = ScoreSnapshot.build(
+        version,
+        scores,
+        summary,
+        metadata={
+            "countries": len(scores),
+            "workers": refresh_workers(),
+            "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+            "featuresRecomputed": len(changed),
+            "rescored": len(rescored),
+            "carriedForward": carried,
+            "featureStoreBytes": store.nbytes,
+            "scoringModels": scoring_models,  # warm state in the scoring worker (anomaly/forecast run only there)
+        },
+        features=store,
+    )
+    _snapshot = snapshot  # publish: single reference swap
+    feature_cache.seed(snapshot.scores, snapshot.features)
+    await asyncio.to_thread(prune_feature_stores, {version} | ({previous.version} if previous else set()))
+    try:
+        await asyncio.to_thread(save_snapshot, snapshot)
+    except OSError as e:
+        print(f"  Warning: could not persist score snapshot: {e}")
+
+    stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in timings.items())
+    print(
+        f"Pre-computed {len(scores)} countries in {elapsed:.1f}s (snapshot v{snapshot.version}; "
+        f"{len(changed)} recomputed, {len(rescored)} rescored; {stages})"
+    )
+    if carried:
+        print(f"  Over {refresh_time_budget():.0f}s budget: carried forward {len(carried)} countries from v{previous.version}")
 
 
 async def refresh_loop() -> None:
-    """Background: refresh pre-computed scores every 15 minutes."""
+    """Background: compute scores now, then refresh them every 15 minutes."""
+    first = True
     while True:
-        await asyncio.sleep(900)
-        await precompute_all_scores()
+        if not first:
+            await asyncio.sleep(900)
+        try:
+            await precompute_all_scores()
+        except Exception as e:
+            print(f"Score refresh failed, keeping previous scores: {e}")
+            continue
+        finally:
+            first = False
         print(f"Scores refreshed at {datetime.utcnow().isoformat()}Z")
 
 
@@ -326,14 +398,40 @@ app.add_middleware(
 )
 
 tracker = PredictionTracker()
+brief_store = BriefStore()
 
 
 @app.on_event("startup")
 async def startup():
-    # FinBERT loaded on first /api/analyze or /api/risk-score call so dashboard comes up fast
-    await precompute_all_scores()
+    # The API process's models (FinBERT, risk scorer) load on background threads so the server accepts traffic
+    # at once; requests that need one await its readiness future (see /ready). Anomaly and forecast models
+    # load in the scoring worker.
+    # Serve the last persisted snapshot (marked stale) immediately; the first recompute runs in the background.
+    global _snapshot, _snapshot_versions
+    t0 = time.perf_counter()
+    snapshot = load_snapshot()
+    if snapshot is not None:
+        _snapshot = snapshot
+        _snapshot_versions = itertools.count(snapshot.version + 1)
+        feature_cache.seed(snapshot.scores, snapshot.features)
+        print(
+            f"Loaded score snapshot v{snapshot.version} ({len(snapshot.scores)} countries, "
+            f"computed {snapshot.computed_at}) in {(time.perf_counter() - t0) * 1000:.0f}ms — serving as stale"
+        )
     asyncio.create_task(refresh_loop())
-    print("Sentinel AI backend ready — all scores cached")
+    start_warmup()
+    print("Sentinel AI backend ready — scores refreshing and models warming in background")
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    _shutdown_pools()
+    model_warmup.shutdown()
+    sentiment_batcher.close()
+    await asyncio.to_thread(tracker.close)
+    await headline_fetcher.aclose()
+    if _openai_client is not None:
+        await _openai_client.close()
 
 
 @app.get("/")
@@ -361,9 +459,48 @@ async def health():
         "api": True,
         "ml": ml_ready,
         "version": MODEL_VERSION,
+        "models": registry.versions(),
+        "caches": {
+            "features": feature_cache.stats(),
+            "dataframes": dataframe_cache.stats(),
+            "headlines": headline_fetcher.stats(),
+            "briefs": brief_store.stats(),
+            "sentiment": {**sentiment_batcher.stats(), "cache": sentiment_cache.stats()},
+            "predictionLog": tracker.stats(),
+        },
+        "snapshot": (
+            {"version": _snapshot.version, "computedAt": _snapshot.computed_at, "stale": _snapshot.stale, **_snapshot.metadata}
+            if _snapshot is not None
+            else None
+        ),
     }
 
 
+@app.get("/ready")
+async def ready():
+    """
+    Readiness (vs /health liveness): warm state and load seconds of the API process's models; 503 while any is
+    still loading or failed to load (failed loads are retried). scoringModels is the scoring worker's state as of the last refresh.
+    """
+    model_warmup.retry_failed()
+    body = {
+        "ready": model_warmup.is_ready(),
+        "models": model_warmup.report(),
+        # None until this process's scoring worker has run (a snapshot loaded from disk reports the old one)
+        "scoringModels": _snapshot.metadata.get("scoringModels") if _snapshot is not None and not _snapshot.stale else None,
+        "snapshot": _snapshot is not None,
+    }
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
+async def _analyze_sentiment(headlines: list[str]) -> dict:
+    """FinBERT sentiment once the background load is done; neutral if it failed (never loads in the request)."""
+    if headlines and not await model_warmup.wait("finbert"):
+        print("  Warning: FinBERT not loaded; using neutral sentiment")
+        headlines = []
+    return await sentiment_batcher.analyze(headlines)
+
+
 def _validate_country(code: str) -> None:
     if code.upper() not in MONITORED_COUNTRIES:
         raise HTTPException(status_code=400, detail=f"Country code {code} not in monitored list")
@@ -376,24 +513,31 @@ async def analyze_country(request: AnalyzeRequest):
     country_code = request.countryCode.strip().upper()
     _validate_country(country_code)
 
-    if not _country_scores or country_code not in _country_scores:
+    snapshot = _current_snapshot()
+    if country_code not in snapshot.scores:
         raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
 
     if is_cache_valid(country_code):
         return _cache[country_code]
 
-    c = _country_scores[country_code]
+    c = snapshot.scores[country_code]
     risk_prediction = c["risk_prediction"]
     anomaly = c["anomaly"]
-    features = c["features"]
+    features = snapshot.features_for(country_code)
 
     headlines = await fetch_headlines(country)
-    finbert_results = analyze_headlines_sentiment(headlines)
+    finbert_results = await _analyze_sentiment(headlines)
 
-    tracker.log_prediction(country_code, risk_prediction, features, MODEL_VERSION)
+    tracker.log_prediction(country_code, risk_prediction, features, MODEL_VERSION, is_anomaly=c["isAnomaly"])
 
     ml_context = build_gpt4o_context(country, risk_prediction, anomaly, finbert_results, headlines, features)
-    brief = await call_gpt4o(ml_context, country, risk_prediction)
+    # Stored per (country, score bucket, headlines); concurrent requests share one GPT-4o call
+    brief = await brief_store.get_or_create(
+        country_code,
+        score_bucket(risk_prediction),
+        headlines_hash(headlines),
+        lambda: call_gpt4o(ml_context, country, risk_prediction),
+    )
 
     if brief is None:
         brief = {
@@ -420,6 +564,7 @@ async def analyze_country(request: AnalyzeRequest):
             "topDrivers": risk_prediction.get("top_drivers", []),
             "dataSources": ["GDELT", "ACLED", "UCDP", "World Bank", "NewsAPI.ai"],
             "modelVersion": MODEL_VERSION,
+            "riskModelVersion": risk_prediction.get("model_version"),
         },
     }
     _cache[country_code] = result
@@ -434,14 +579,14 @@ async def api_risk_score(request: RiskScoreRequest):
     country = request.country
 
     headlines = await fetch_headlines(country)
-    finbert_results = analyze_headlines_sentiment(headlines)
-    gdelt_df = load_gdelt_cache(country_code)
-    acled_df = load_acled_cache(country)
-    ucdp_df = load_ucdp_cache(country)
-    wb_features = load_wb_cache(country_code)
-    pipeline = SentinelFeaturePipeline(country_code, country)
-    features = pipeline.compute(gdelt_df, acled_df, ucdp_df, wb_features, headlines, finbert_results)
-
+    finbert_results = await _analyze_sentiment(headlines)
+    # Source features from the fingerprint-keyed cache (shared with the precompute); only sentiment is per-request
+    base = await asyncio.to_thread(feature_cache.compute, country_code)
+    features = with_sentiment(base, finbert_results)
+
+    if not await model_warmup.wait("risk_scorer"):
+        error = model_warmup.report().get("risk_scorer", {}).get("error")
+        raise HTTPException(status_code=503, detail=f"Risk scorer failed to load ({error}); retrying in the background, see /ready.")
     try:
         risk_prediction = predict_risk(features)
     except FileNotFoundError:
@@ -452,8 +597,7 @@ async def api_risk_score(request: RiskScoreRequest):
 @app.get("/api/anomalies")
 async def api_anomalies():
     """Return pre-computed anomaly flags for all countries (instant)."""
-    if not _country_scores:
-        raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
+    snapshot = _current_snapshot()
     return [
         {
             "countryCode": code,
@@ -462,61 +606,88 @@ async def api_anomalies():
             "anomalyScore": c["anomalyScore"],
             "severity": c["severity"],
         }
-        for code, c in _country_scores.items()
+        for code, c in snapshot.scores.items()
     ]
 
 
 @app.post("/api/forecast")
 async def api_forecast(request: ForecastRequest):
+    """Return the pre-computed 30/60/90-day forecast for one country (instant; batched during refresh)."""
     country_code = request.countryCode.strip().upper()
     _validate_country(country_code)
-    country = request.country
-
-    gdelt_df = load_gdelt_cache(country_code)
-    acled_df = load_acled_cache(country)
-    ucdp_df = load_ucdp_cache(country)
-    wb_features = load_wb_cache(country_code)
-    pipeline = SentinelFeaturePipeline(country_code, country)
-    features = pipeline.compute(gdelt_df, acled_df, ucdp_df, wb_features)
-
-    seq = _build_forecast_sequence(features)
-    try:
-        forecast = forecast_risk(seq)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    snapshot = _current_snapshot()
+    if country_code not in snapshot.scores:
+        raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
     return {
         "countryCode": country_code,
-        "country": country,
-        **forecast,
+        "country": request.country,
+        **snapshot.scores[country_code]["forecast"],
     }
 
 
+@app.get("/api/forecasts")
+async def api_forecasts():
+    """Return pre-computed forecasts for all countries (instant)."""
+    snapshot = _current_snapshot()
+    return [
+        {
+            "countryCode": code,
+            "country": c["name"],
+            **c["forecast"],
+        }
+        for code, c in snapshot.scores.items()
+    ]
+
+
 @app.get("/api/countries")
 async def api_countries():
     """Return pre-computed risk scores for all countries (instant)."""
-    if not _country_scores:
-        raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
+    snapshot = _current_snapshot()
     return [
         {
             "countryCode": code,
             "country": c["name"],
             "riskScore": c["riskScore"],
             "riskLevel": c["riskLevel"],
+            "stale": c.get("stale", False),
+            "staleSince": c.get("staleSince"),
         }
-        for code, c in _country_scores.items()
+        for code, c in snapshot.scores.items()
     ]
 
 
 @app.get("/api/dashboard/summary")
 async def api_dashboard_summary():
     """Return pre-computed dashboard KPIs (instant; no on-demand computation)."""
-    if not _dashboard_summary:
-        raise HTTPException(status_code=503, detail="Scores not yet computed; wait for backend startup to finish.")
-    return _dashboard_summary
+    return _current_snapshot().summary
 
 
 @app.get("/api/track-record")
-async def api_track_record():
-    record = tracker.get_track_record(limit=20)
+async def api_track_record(features: bool = False):
+    record = tracker.get_track_record(limit=20, include_features=features)
     accuracy = tracker.compute_accuracy(days_back=90)
     return {"predictions": record, "accuracy": accuracy}
+
+
+def _track_record_analytics(days: int) -> dict:
+    return {
+        "accuracy": tracker.compute_accuracy(days_back=days),
+        "byCountry": tracker.accuracy_by_country(days_back=days),
+        "confusion": tracker.confusion_matrix(days_back=days),
+        "calibration": tracker.calibration(days_back=days),
+    }
+
+
+@app.get("/api/track-record/analytics")
+async def api_track_record_analytics(days: int = 90):
+    """Accuracy breakdowns computed in SQL: per country, confusion matrix and confidence calibration."""
+    return await asyncio.to_thread(_track_record_analytics, days)
+
+
+@app.get("/api/track-record/{country_code}/history")
+async def api_prediction_history(country_code: str, days: int = 365):
+    """Logged score history for one country (raw days, then daily and weekly rollups)."""
+    country_code = country_code.upper()
+    _validate_country(country_code)
+    history = await asyncio.to_thread(tracker.history, country_code, days)
+    return {"countryCode": country_code, "history": history}
@@ -2,6 +2,8 @@
 # Isolation Forest anomaly detectors: one model per country on weekly GDELT aggregates.
 # See GitHub Issue #15.
 
+import os
+from functools import lru_cache
 from pathlib import Path
 
 import joblib
@@ -10,6 +12,10 @@ import pandas as pd
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+from backend.ml.columnar import read_source
+from backend.ml.data.fetch_gdelt import gdelt_dates
+from backend.ml.registry import LoadedModel, ModelRegistry
+
 ANOMALY_FEATURES = [
     "goldstein_mean",
     "goldstein_std",
@@ -44,8 +50,9 @@ WEEKLY_GDELT_COLUMNS = [
 ]
 
 
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
-    """Repo root: directory that contains data/gdelt/ (works from any cwd)."""
+    """Repo root: directory that contains data/gdelt/ (works from any cwd). Resolved once per process."""
     this_file = Path(__file__).resolve()
     # Try __file__-based: backend/ml/anomaly.py -> parents[2] = repo root
     for level in [2, 3]:
@@ -62,10 +69,8 @@ def _repo_root() -> Path:
 
 
 def _models_dir() -> Path:
-    """models/ at repo root."""
-    d = _repo_root() / "models"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
+    """models/ at repo root (not created here; training calls mkdir before saving)."""
+    return _repo_root() / "models"
 
 
 def _gdelt_path(country_code: str) -> Path:
@@ -83,7 +88,7 @@ def _load_gdelt_csv(path: Path) -> pd.DataFrame | None:
         return None
     if path.stat().st_size <= 90:
         return None  # header-only or empty
-    df = pd.read_csv(path)
+    df = read_source("gdelt", path, prune=False)
     df.columns = df.columns.str.strip()
     if "_weekly_aggregate" in df.columns:
         missing = [c for c in WEEKLY_GDELT_COLUMNS if c not in df.columns]
@@ -132,8 +137,7 @@ def train_anomaly_detector(country_code: str, gdelt_df: pd.DataFrame):
         weekly = weekly.fillna(0)
     else:
         # Raw-event format: aggregate by week
-        sqldate = df["SQLDATE"].astype(str).str.replace(r"\.0$", "", regex=True)
-        df["date"] = pd.to_datetime(sqldate, format="%Y%m%d", errors="coerce")
+        df["date"] = gdelt_dates(df)
         df = df.dropna(subset=["date"])
         for col in ["GoldsteinScale", "NumMentions", "AvgTone"]:
             if col in df.columns:
@@ -172,6 +176,7 @@ def train_anomaly_detector(country_code: str, gdelt_df: pd.DataFrame):
     model.fit(X_scaled)
 
     models_dir = _models_dir()
+    models_dir.mkdir(parents=True, exist_ok=True)
     joblib.dump(model, models_dir / f"anomaly_{country_code}.pkl")
     joblib.dump(scaler, models_dir / f"scaler_{country_code}.pkl")
     print(f"  Trained anomaly detector for {country_code} on {n_weeks} weeks")
@@ -195,8 +200,7 @@ def train_all_anomaly_detectors() -> None:
                 weeks = len(df)
             else:
                 df = df.copy()
-                sqldate = df["SQLDATE"].astype(str).str.replace(r"\.0$", "", regex=True)
-                df["date"] = pd.to_datetime(sqldate, format="%Y%m%d", errors="coerce")
+                df["date"] = gdelt_dates(df)
                 df = df.dropna(subset=["date"])
                 weeks = df["date"].dt.to_period("W").nunique()
             if weeks < MIN_WEEKS_FOR_TRAINING:
@@ -208,44 +212,126 @@ def train_all_anomaly_detectors() -> None:
     print(f"Trained anomaly detectors for {count} countries")
 
 
+def _load_detector(model_path: Path, scaler_path: Path, mmap_mode: str | None = None) -> dict:
+    return {
+        "model": joblib.load(model_path, mmap_mode=mmap_mode),
+        "scaler": joblib.load(scaler_path, mmap_mode=mmap_mode),
+    }
+
+
+class AnomalyModelBank:
+    """
+    In-memory bank of per-country Isolation Forests + scalers.
+    Each country is loaded lazily on first use (or all at once via preload()), kept in LRU order
+    under an optional byte budget, and reloaded when anomaly_{CC}.pkl / scaler_{CC}.pkl change on disk.
+    mmap_mode="r" memory-maps the tree arrays (joblib uncompressed dumps) so workers share pages.
+    """
+
+    def __init__(self, max_bytes: int | None = None, mmap_mode: str | None = None):
+        self.mmap_mode = mmap_mode
+        self._registry = ModelRegistry(max_bytes=max_bytes)
+
+    def _loader(self, model_path: Path, scaler_path: Path) -> dict:
+        return _load_detector(model_path, scaler_path, self.mmap_mode)
+
+    def get(self, country_code: str) -> LoadedModel | None:
+        """Registry entry ({"model", "scaler"}) for a country, or None if it has no trained detector."""
+        models_dir = _models_dir()
+        paths = [models_dir / f"anomaly_{country_code}.pkl", models_dir / f"scaler_{country_code}.pkl"]
+        try:
+            return self._registry.get(country_code, paths, self._loader)
+        except FileNotFoundError:
+            return None
+
+    def preload(self, country_codes: list[str] | None = None) -> int:
+        """Load detectors for the given countries (default: every anomaly_*.pkl in models/). Returns count loaded."""
+        if country_codes is None:
+            models_dir = _models_dir()
+            if not models_dir.exists():
+                return 0
+            country_codes = sorted(p.stem.replace("anomaly_", "") for p in models_dir.glob("anomaly_*.pkl"))
+        return sum(1 for code in country_codes if self.get(code) is not None)
+
+    def stats(self) -> dict:
+        return self._registry.stats()
+
+
+def _bank_budget_bytes() -> int | None:
+    mb = os.getenv("SENTINEL_ANOMALY_CACHE_MB")
+    return int(float(mb) * 1024 * 1024) if mb else None
+
+
+model_bank = AnomalyModelBank(
+    max_bytes=_bank_budget_bytes(),
+    mmap_mode=os.getenv("SENTINEL_ANOMALY_MMAP") or None,
+)
+
+
+def _severity(anomaly_scores: np.ndarray) -> np.ndarray:
+    return np.select([anomaly_scores > 0.7, anomaly_scores > 0.4], ["HIGH", "MED"], default="LOW")
+
+
+def detect_anomaly_batch(country_codes: list[str], inputs: list[dict]) -> list[dict]:
+    """
+    Anomaly detection for many countries at once (inputs as built by main._anomaly_input_from_features).
+    Scaling is one vectorized op over all rows; each country's forest is walked once via score_samples,
+    and the predict() decision is derived from that score (score - offset_ < 0) instead of a second pass.
+    Returns one dict per input, same keys and values as detect_anomaly(); LOW default when no model exists.
+    """
+    X = np.array(
+        [[inp.get(f, 0) for f in ANOMALY_FEATURES] for inp in inputs], dtype=np.float64
+    ).reshape(len(inputs), len(ANOMALY_FEATURES))
+    raw_scores = np.zeros(len(inputs))
+    is_anomaly = np.zeros(len(inputs), dtype=bool)
+    has_model = np.zeros(len(inputs), dtype=bool)
+
+    rows_by_country: dict[str, list[int]] = {}
+    for i, code in enumerate(country_codes):
+        rows_by_country.setdefault(code, []).append(i)
+    detectors = []
+    for code, rows in rows_by_country.items():
+        detector = model_bank.get(code)
+        if detector is not None:
+            detectors.append((rows, detector.obj["model"], detector.obj["scaler"]))
+            has_model[rows] = True
+
+    if detectors:
+        # Batched StandardScaler.transform: per-row mean/scale from each row's scaler
+        mean = np.zeros_like(X)
+        scale = np.ones_like(X)
+        for rows, _, scaler in detectors:
+            if getattr(scaler, "mean_", None) is not None:
+                mean[rows] = scaler.mean_
+            if getattr(scaler, "scale_", None) is not None:
+                scale[rows] = scaler.scale_
+        X_scaled = (X - mean) / scale
+        for rows, model, _ in detectors:
+            raw = model.score_samples(X_scaled[rows])
+            raw_scores[rows] = raw
+            # IsolationForest.predict() == -1 exactly when decision_function = score_samples - offset_ < 0
+            is_anomaly[rows] = (raw - model.offset_) < 0
+
+    # Normalize to 0–1: score_samples is negative for anomalies; map to [0,1]
+    anomaly_scores = np.clip((-raw_scores - 0.3) / 0.7, 0.0, 1.0)
+    anomaly_scores[~has_model] = 0.0
+    severity = _severity(anomaly_scores)
+    return [
+        {
+            "anomaly_score": round(float(anomaly_scores[i]), 3),
+            "is_anomaly": bool(is_anomaly[i]),
+            "severity": str(severity[i]),
+        }
+        for i in range(len(inputs))
+    ]
+
+
 def detect_anomaly(country_code: str, current_features: dict) -> dict:
     """
-    Run anomaly detection on current features.
+    Run anomaly detection on current features (detector served from the in-memory model_bank).
     Returns dict with anomaly_score (0–1), is_anomaly (bool), severity (LOW/MED/HIGH).
     If model files are missing, returns default LOW.
     """
-    models_dir = _models_dir()
-    model_path = models_dir / f"anomaly_{country_code}.pkl"
-    scaler_path = models_dir / f"scaler_{country_code}.pkl"
-    try:
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-    except FileNotFoundError:
-        return {
-            "anomaly_score": 0.0,
-            "is_anomaly": False,
-            "severity": "LOW",
-        }
-
-    X = np.array([[current_features.get(f, 0) for f in ANOMALY_FEATURES]])
-    X_scaled = scaler.transform(X)
-    raw_score = model.score_samples(X_scaled)[0]
-    # Normalize to 0–1: score_samples is negative for anomalies; map to [0,1]
-    anomaly_score = max(0.0, min(1.0, (-raw_score - 0.3) / 0.7))
-    is_anomaly = model.predict(X_scaled)[0] == -1
-
-    severity = (
-        "HIGH"
-        if anomaly_score > 0.7
-        else "MED"
-        if anomaly_score > 0.4
-        else "LOW"
-    )
-    return {
-        "anomaly_score": round(float(anomaly_score), 3),
-        "is_anomaly": bool(is_anomaly),
-        "severity": severity,
-    }
+    return detect_anomaly_batch([country_code], [current_features])[0]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+# Sentinel AI — GPT-4o brief store
+# Briefs are keyed by (country, score bucket, headlines hash) and persisted in SQLite, so a restart keeps them
+# and a brief is regenerated only when the score moves to another bucket or the headlines change.
+# Concurrent requests for the same key share one generation (single-flight).
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+BRIEFS_PER_COUNTRY = 20  # older rows are pruned on insert
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def score_bucket(risk_prediction: dict, width: int | None = None) -> str:
+    """Risk level + score rounded down to `width` points (SENTINEL_BRIEF_BUCKET, default 5), e.g. "HIGH:65"."""
+    width = width or int(os.getenv("SENTINEL_BRIEF_BUCKET", "5"))
+    score = int(risk_prediction.get("risk_score", 0))
+    return f"{risk_prediction.get('risk_level', '')}:{score - score % max(width, 1)}"
+
+
+def headlines_hash(headlines: list[str]) -> str:
+    """Short sha256 over the (stripped, ordered) headlines the brief is written from."""
+    h = hashlib.sha256()
+    for line in headlines or []:
+        h.update(line.strip().encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()[:16]
+
+
+class BriefStore:
+    """
+    SQLite-backed brief cache with an in-memory LRU in front.
+    get_or_create() returns the stored brief for a key, or runs generate() once for all concurrent callers
+    and stores its result. A None result (no API key, API error) is returned but never stored.
+    """
+
+    def __init__(self, db_path: str | None = None, max_memory_entries: int = 256):
+        if db_path is None:
+            db_path = str(_repo_root() / "sentinel_briefs.db")
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self._memory: OrderedDict[tuple[str, str, str], dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[str, str, str], asyncio.Task] = {}
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.generated = 0
+        self.coalesced = 0
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS briefs (
+                    country_code TEXT NOT NULL,
+                    score_bucket TEXT NOT NULL,
+                    headlines_hash TEXT NOT NULL,
+                    brief TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (country_code, score_bucket, headlines_hash)
+                )
+            """)
+            conn.commit()
+
+    def _remember(self, key: tuple[str, str, str], brief: dict) -> None:
+        with self._lock:
+            self._memory[key] = brief
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def load(self, key: tuple[str, str, str]) -> dict | None:
+        """Stored brief for key, or None."""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT brief FROM briefs WHERE country_code = ? AND score_bucket = ? AND headlines_hash = ?",
+                key,
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: tuple[str, str, str], brief: dict) -> None:
+        """Upsert one brief and keep only the newest BRIEFS_PER_COUNTRY for its country."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO briefs (country_code, score_bucket, headlines_hash, brief, created_at) VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(brief), datetime.utcnow().isoformat() + "Z"),
+            )
+            conn.execute(
+                """
+                DELETE FROM briefs WHERE country_code = ? AND rowid NOT IN (
+                    SELECT rowid FROM briefs WHERE country_code = ? ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (key[0], key[0], BRIEFS_PER_COUNTRY),
+            )
+            conn.commit()
+
+    async def get_or_create(
+        self,
+        country_code: str,
+        bucket: str,
+        headline_hash: str,
+        generate: Callable[[], Awaitable[dict | None]],
+    ) -> dict | None:
+        """Brief for (country_code, bucket, headline_hash): memory, then SQLite, then one shared generate()."""
+        key = (country_code, bucket, headline_hash)
+        brief = self._memory.get(key)
+        if brief is not None:
+            self.memory_hits += 1
+            self._remember(key, brief)  # refresh LRU position so hot countries are evicted last
+            return brief
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load_or_generate(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: a disconnecting caller must not cancel the generation others are waiting on
+        return await asyncio.shield(task)
+
+    async def _load_or_generate(self, key: tuple[str, str, str], generate) -> dict | None:
+        brief = await asyncio.to_thread(self.load, key)
+        if brief is not None:
+            self.db_hits += 1
+            self._remember(key, brief)
+            return brief
+        brief = await generate()
+        if brief is None:
+            return None
+        self.generated += 1
+        self._remember(key, brief)
+        try:
+            await asyncio.to_thread(self.save, key, brief)
+        except sqlite3.Error as e:
+            print(f"  Warning: could not persist brief for {key[0]}: {e}")
+        return brief
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "generated": self.generated,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,197 @@
+# Sentinel AI — columnar (Parquet) copies of the per-country source CSVs
+# A conversion stage writes typed, zstd-compressed, year-partitioned Parquet datasets next to the CSVs;
+# readers pick only the columns and the date range they need and fall back to the CSV when no fresh copy exists.
+# Run: python -m backend.ml.columnar
+
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from backend.ml.data.fetch_gdelt import gdelt_dates
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+COLUMNAR_FORMAT_VERSION = 1
+MANIFEST_NAME = "_manifest.json"  # "_" prefix: ignored by pyarrow dataset discovery
+
+# Columns the feature functions actually read; everything else (e.g. ACLED free-text notes) is skipped
+ACLED_COLUMNS = {"event_date", "event_type", "fatalities", "actor1", "admin1"}
+UCDP_COLUMNS = {"year", "type_of_violence", "deaths_a", "deaths_b", "deaths_civilians"}
+FEATURE_COLUMNS_BY_SOURCE = {"gdelt": None, "acled": ACLED_COLUMNS, "ucdp": UCDP_COLUMNS}
+
+# Compact dtypes for repetitive strings
+CATEGORY_COLUMNS = {"acled": ("event_type", "actor1", "admin1")}
+
+# Typed date column per source (partition key is its year); UCDP is yearly and small, so unpartitioned
+DATE_COLUMNS = {"gdelt": "date", "acled": "event_date", "ucdp": None}
+PARTITION_COLUMN = "date_year"  # not "year": ACLED and UCDP already have a year column
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def columnar_dir(source: str, csv_path: Path) -> Path:
+    """data/columnar/{source}/{csv stem}/ — one Parquet dataset per source CSV."""
+    return _repo_root() / "data" / "columnar" / source / Path(csv_path).stem
+
+
+def read_source_csv(source: str, path: Path, prune: bool = True) -> pd.DataFrame:
+    """Parse one source CSV; with prune, only the feature columns and compact dtypes."""
+    if not prune:
+        return pd.read_csv(path)
+    wanted = FEATURE_COLUMNS_BY_SOURCE.get(source)
+    kwargs = {}
+    if wanted is not None:
+        kwargs["usecols"] = lambda c: c in wanted
+    if source in CATEGORY_COLUMNS:
+        kwargs["dtype"] = {c: "category" for c in CATEGORY_COLUMNS[source]}
+    return pd.read_csv(path, **kwargs)
+
+
+def _typed_frame(source: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Parse dates once at conversion so readers never re-parse SQLDATE / event_date strings."""
+    df.columns = df.columns.str.strip()
+    if source == "gdelt" and "SQLDATE" in df.columns:
+        df["date"] = gdelt_dates(df)
+    elif source == "acled" and "event_date" in df.columns:
+        df["event_date"] = pd.to_datetime(df["event_date"], errors="coerce")
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].astype("string")  # mixed int/str object columns are not Arrow-convertible
+    return df
+
+
+def convert_source(source: str, csv_path: Path) -> dict | None:
+    """
+    Write the Parquet copy of one source CSV (atomically replacing any previous copy) and return its manifest.
+    The manifest records the CSV's (size, mtime_ns) so readers can tell a stale copy from a fresh one.
+    """
+    if not _HAS_PYARROW:
+        raise ImportError("pyarrow is required for the columnar store (pip install pyarrow)")
+    csv_path = Path(csv_path)
+    st = csv_path.stat()
+    df = _typed_frame(source, pd.read_csv(csv_path, low_memory=False))
+    date_col = DATE_COLUMNS.get(source)
+    if date_col not in df.columns:
+        date_col = None
+    partitioning = None
+    if date_col is not None:
+        df[PARTITION_COLUMN] = df[date_col].dt.year.astype("Int64")
+        partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.int64())]), flavor="hive")
+
+    out_dir = columnar_dir(source, csv_path)
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    ds.write_dataset(
+        pa.Table.from_pandas(df, preserve_index=False),
+        tmp_dir,
+        format="parquet",
+        partitioning=partitioning,
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+    dates = df[date_col].dropna() if date_col is not None else pd.Series(dtype="datetime64[ns]")
+    manifest = {
+        "format": COLUMNAR_FORMAT_VERSION,
+        "source": source,
+        "csv": {"path": str(csv_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "rows": int(len(df)),
+        "date_column": date_col,
+        "min_date": dates.min().isoformat() if not dates.empty else None,
+        "max_date": dates.max().isoformat() if not dates.empty else None,
+    }
+    with open(tmp_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    tmp_dir.rename(out_dir)
+    return manifest
+
+
+def load_manifest(source: str, csv_path: Path) -> dict | None:
+    """Manifest of a fresh Parquet copy of csv_path, or None (no pyarrow, no copy, or CSV changed since)."""
+    if not _HAS_PYARROW:
+        return None
+    path = columnar_dir(source, csv_path) / MANIFEST_NAME
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        st = Path(csv_path).stat()
+    except (FileNotFoundError, ValueError):
+        return None
+    csv = manifest.get("csv", {})
+    if manifest.get("format") != COLUMNAR_FORMAT_VERSION or (csv.get("size"), csv.get("mtime_ns")) != (st.st_size, st.st_mtime_ns):
+        return None
+    return manifest
+
+
+def source_signature(source: str, csv_path: Path) -> tuple:
+    """(csv mtime_ns, csv size, manifest mtime_ns or 0) — changes when either the CSV or its copy changes."""
+    st = Path(csv_path).stat()
+    try:
+        manifest_mtime = (columnar_dir(source, csv_path) / MANIFEST_NAME).stat().st_mtime_ns
+    except FileNotFoundError:
+        manifest_mtime = 0
+    return (st.st_mtime_ns, st.st_size, manifest_mtime)
+
+
+def read_source(source: str, csv_path: Path, lookback_days: int | None = None, prune: bool = True) -> pd.DataFrame:
+    """
+    DataFrame for one source file. From the Parquet copy when fresh: only the feature columns (prune) and,
+    with lookback_days, only rows dated within lookback_days of the newest row (whole year partitions are skipped).
+    Otherwise the CSV is parsed in full; feature windows are anchored on the newest row either way, so both
+    paths yield the same features.
+    """
+    manifest = load_manifest(source, csv_path)
+    if manifest is None:
+        return read_source_csv(source, csv_path, prune=prune)
+
+    dataset = ds.dataset(columnar_dir(source, csv_path), format="parquet", partitioning="hive")
+    names = [n for n in dataset.schema.names if n != PARTITION_COLUMN]
+    wanted = FEATURE_COLUMNS_BY_SOURCE.get(source) if prune else None
+    date_col = manifest.get("date_column")
+    if wanted is not None:
+        names = [n for n in names if n in wanted]
+
+    expr = None
+    if lookback_days is not None and date_col is not None and manifest.get("max_date"):
+        since = pd.Timestamp(manifest["max_date"]) - pd.Timedelta(days=lookback_days)
+        date_type = dataset.schema.field(date_col).type
+        expr = (ds.field(PARTITION_COLUMN) >= since.year) & (ds.field(date_col) >= pa.scalar(since.to_pydatetime(), type=date_type))
+
+    df = dataset.to_table(columns=names, filter=expr).to_pandas()
+    for col in CATEGORY_COLUMNS.get(source, ()):
+        if prune and col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def convert_all() -> list[dict]:
+    """Convert every GDELT / ACLED / UCDP CSV under data/ and return the manifests written."""
+    root = _repo_root() / "data"
+    jobs = [
+        ("gdelt", sorted((root / "gdelt").glob("*_events.csv"))),
+        ("acled", sorted((root / "acled").glob("*.csv"))),
+        ("ucdp", sorted((root / "ucdp").glob("*_ged.csv"))),
+    ]
+    manifests = []
+    for source, paths in jobs:
+        for path in paths:
+            if load_manifest(source, path) is not None:
+                continue  # copy is up to date
+            try:
+                manifests.append(convert_source(source, path))
+            except Exception as e:
+                print(f"  Warning: {source} {path.name} failed - {e}")
+    return manifests
+
+
+if __name__ == "__main__":
+    written = convert_all()
+    rows = sum(m["rows"] for m in written)
+    print(f"Columnar store: converted {len(written)} files ({rows} rows) into data/columnar/")
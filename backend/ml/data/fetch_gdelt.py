@@ -219,6 +219,14 @@ def fetch_gdelt_all_countries(days_back: int = 3650) -> None:
     print(f"GDELT complete: {len(csvs)} country files")
 
 
+def gdelt_dates(df: pd.DataFrame) -> pd.Series:
+    """Event dates as datetime64: the typed `date` column of the columnar store, else parsed from SQLDATE."""
+    if "date" in df.columns and pd.api.types.is_datetime64_any_dtype(df["date"]):
+        return df["date"]
+    sqldate = df["SQLDATE"].astype(str).str.replace(r"\.0$", "", regex=True)
+    return pd.to_datetime(sqldate, format="%Y%m%d", errors="coerce")
+
+
 def compute_gdelt_features(df: pd.DataFrame, window_days: int = 30) -> dict:
     """
     Compute 10 ML-ready GDELT features per ML Guide Section 2.1.
@@ -240,7 +248,7 @@ def compute_gdelt_features(df: pd.DataFrame, window_days: int = 30) -> dict:
     is_weekly = "_weekly_aggregate" in df.columns
 
     if is_weekly:
-        df["date"] = pd.to_datetime(df["SQLDATE"].astype(str), format="%Y%m%d", errors="coerce")
+        df["date"] = gdelt_dates(df)
         df = df.dropna(subset=["date"])
         if df.empty:
             return zeros
@@ -279,7 +287,7 @@ def compute_gdelt_features(df: pd.DataFrame, window_days: int = 30) -> dict:
         }
 
     else:
-        df["date"] = pd.to_datetime(df["SQLDATE"].astype(str), format="%Y%m%d", errors="coerce")
+        df["date"] = gdelt_dates(df)
         df = df.dropna(subset=["date"])
         ref_date = df["date"].max()
         recent = df[df["date"] > ref_date - pd.Timedelta(days=window_days)]
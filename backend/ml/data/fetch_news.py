@@ -0,0 +1,148 @@
+# Sentinel AI — NewsAPI headline fetcher
+# One keep-alive httpx client for the whole API process, a per-country TTL cache, single-flight coalescing
+# (concurrent requests for one country share one upstream call) and a daily/per-minute request budget.
+# SENTINEL_NEWS_URL points it at a local stand-in server for testing.
+
+import asyncio
+import os
+import time
+from collections import deque
+
+import httpx
+
+DEFAULT_NEWS_URL = "https://newsapi.org/v2/everything"
+
+
+class HeadlineFetcher:
+    """
+    Async headline source for /api/analyze and /api/risk-score.
+    Fresh cache entries are returned without a request; an expired or missing entry triggers one upstream
+    call per country no matter how many callers are waiting. When the budget is spent, NewsAPI rate-limits
+    us (429) or the call fails, the last cached headlines are served (or [] if there are none).
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        ttl_seconds: float | None = None,
+        daily_quota: int | None = None,
+        per_minute: int | None = None,
+        timeout: float = 10.0,
+        max_entries: int = 512,
+    ):
+        self.base_url = base_url or os.getenv("SENTINEL_NEWS_URL", DEFAULT_NEWS_URL)
+        self.api_key = api_key
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("SENTINEL_NEWS_TTL_S", "900"))
+        self.daily_quota = daily_quota if daily_quota is not None else int(os.getenv("SENTINEL_NEWS_DAILY_QUOTA", "100"))
+        self.per_minute = per_minute if per_minute is not None else int(os.getenv("SENTINEL_NEWS_PER_MINUTE", "30"))
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self._client: httpx.AsyncClient | None = None
+        self._cache: dict[tuple[str, int], tuple[float, list[str]]] = {}  # key -> (fetched monotonic, headlines)
+        self._inflight: dict[tuple[str, int], asyncio.Task] = {}
+        self._calls_day: deque[float] = deque()
+        self._calls_minute: deque[float] = deque()
+        self._blocked_until = 0.0
+        self.hits = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared client (app shutdown)."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _take_budget(self) -> bool:
+        """Reserve one upstream call if the rolling day/minute budgets and any 429 back-off allow it."""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return False
+        for calls, window in ((self._calls_day, 86400.0), (self._calls_minute, 60.0)):
+            while calls and now - calls[0] >= window:
+                calls.popleft()
+        if len(self._calls_day) >= self.daily_quota or len(self._calls_minute) >= self.per_minute:
+            return False
+        self._calls_day.append(now)
+        self._calls_minute.append(now)
+        return True
+
+    async def fetch(self, country: str, max_headlines: int = 10) -> list[str]:
+        """Up to max_headlines recent headline titles for country ([] without NEWS_API)."""
+        api_key = self.api_key or os.getenv("NEWS_API")
+        if not api_key:
+            return []
+        key = (country.strip().lower(), max_headlines)
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self.ttl_seconds:
+            self.hits += 1
+            return list(entry[1])
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._refresh(key, country, max_headlines, api_key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # shield: a caller that disconnects must not cancel the call other callers are waiting on
+        return list(await asyncio.shield(task))
+
+    async def _refresh(self, key: tuple[str, int], country: str, max_headlines: int, api_key: str) -> list[str]:
+        stale = self._cache.get(key)
+        fallback = list(stale[1]) if stale is not None else []
+        if not self._take_budget():
+            self.throttled += 1
+            return fallback
+        self.upstream_calls += 1
+        try:
+            resp = await self._get_client().get(
+                self.base_url,
+                params={
+                    "q": country,
+                    "sortBy": "publishedAt",
+                    "pageSize": max_headlines,
+                    "apiKey": api_key,
+                },
+            )
+            if resp.status_code == 429:
+                retry_after = resp.headers.get("Retry-After", "")
+                self._blocked_until = time.monotonic() + (float(retry_after) if retry_after.isdigit() else 60.0)
+                self.throttled += 1
+                return fallback
+            resp.raise_for_status()
+            data = resp.json()
+            headlines = [a["title"] for a in data.get("articles", []) if a.get("title")]
+        except Exception:
+            self.errors += 1
+            return fallback
+        self._cache.pop(key, None)
+        self._cache[key] = (time.monotonic(), headlines)
+        while len(self._cache) > self.max_entries:
+            self._cache.pop(next(iter(self._cache)))
+        return headlines
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+            "throttled": self.throttled,
+            "errors": self.errors,
+            "calls_last_24h": len(self._calls_day),
+            "daily_quota": self.daily_quota,
+        }
+
+
+headline_fetcher = HeadlineFetcher()
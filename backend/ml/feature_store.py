@@ -0,0 +1,140 @@
+# Sentinel AI — compact per-country feature store
+# Every country's 47 features as one (N, 47) float32 matrix in FEATURE_COLUMNS order plus a code -> row index,
+# persisted as .npy + JSON so the API and worker processes can memory-map it instead of holding feature dicts.
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from backend.ml.pipeline import FEATURE_COLUMNS, INT_FEATURE_COLUMNS, features_to_matrix
+
+FEATURE_STORE_FORMAT_VERSION = 1
+FEATURE_DTYPE = np.float32  # 47 * 4 = 188 bytes per country
+
+_COLUMN_INDEX = {col: i for i, col in enumerate(FEATURE_COLUMNS)}
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def feature_store_dir(version: int) -> Path:
+    """data/cache/features/v{version}/ — one directory per score snapshot version."""
+    return _repo_root() / "data" / "cache" / "features" / f"v{version}"
+
+
+def prune_feature_stores(keep: set[int]) -> None:
+    """Delete persisted stores for every snapshot version not in keep (open memory maps stay valid)."""
+    root = _repo_root() / "data" / "cache" / "features"
+    if not root.exists():
+        return
+    names = {feature_store_dir(v).name for v in keep}
+    for path in root.iterdir():
+        if path.is_dir() and path.name not in names:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class FeatureStore:
+    """
+    Read-only (N, 47) float32 feature matrix with a code -> row index.
+    Batch scoring takes matrix / rows() directly; features() rebuilds one country's dict for display and logging.
+    XGBoost evaluates float32 inputs, so risk scores from the store match the float64 dict path.
+    """
+
+    def __init__(self, codes: list[str], matrix: np.ndarray):
+        matrix = np.asarray(matrix, dtype=FEATURE_DTYPE)
+        if matrix.shape != (len(codes), len(FEATURE_COLUMNS)):
+            raise ValueError(f"Feature matrix shape {matrix.shape} does not match {len(codes)} codes x {len(FEATURE_COLUMNS)}")
+        if matrix.flags.writeable:
+            matrix.setflags(write=False)
+        self.codes = tuple(codes)
+        self.index = {code: i for i, code in enumerate(self.codes)}
+        self.matrix = matrix
+
+    @classmethod
+    def from_features(cls, features: dict[str, dict], codes: list[str] | None = None) -> "FeatureStore":
+        """Store from {code: feature dict}; rows follow codes (default: dict order)."""
+        codes = list(codes if codes is not None else features)
+        return cls(codes, features_to_matrix([features.get(code, {}) for code in codes]))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.index
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.matrix.nbytes)
+
+    def row(self, code: str) -> np.ndarray | None:
+        """(47,) view of one country's features, or None."""
+        i = self.index.get(code)
+        return None if i is None else self.matrix[i]
+
+    def rows(self, codes: list[str]) -> np.ndarray:
+        """(len(codes), 47) matrix; the stored matrix itself (no copy) when codes are all rows in order."""
+        idx = [self.index[code] for code in codes]
+        if idx == list(range(len(self.codes))):
+            return self.matrix
+        return self.matrix[idx]
+
+    def features(self, code: str) -> dict:
+        """Feature dict for one country (same keys and int/float types as the pipeline), {} if absent."""
+        row = self.row(code)
+        if row is None:
+            return {}
+        return {
+            col: int(round(float(v))) if col in INT_FEATURE_COLUMNS else round(float(v), 6)
+            for col, v in zip(FEATURE_COLUMNS, row)
+        }
+
+    def with_column(self, column: str, values) -> "FeatureStore":
+        """Copy with one feature column replaced (values in row order)."""
+        matrix = np.array(self.matrix, dtype=FEATURE_DTYPE)
+        matrix[:, _COLUMN_INDEX[column]] = values
+        return FeatureStore(list(self.codes), matrix)
+
+    def save(self, directory: Path) -> Path:
+        """
+        Write matrix.npy and index.json into directory, each via a temp file and rename, so a reader
+        that maps the files never sees a torn write.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / "matrix.npy.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.matrix))
+        os.replace(tmp, directory / "matrix.npy")
+        index = {
+            "format": FEATURE_STORE_FORMAT_VERSION,
+            "codes": list(self.codes),
+            "columns": FEATURE_COLUMNS,
+            "dtype": np.dtype(FEATURE_DTYPE).name,
+        }
+        tmp = directory / "index.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp, directory / "index.json")
+        return directory
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "FeatureStore":
+        """Open a saved store; with mmap the matrix is a read-only memory map shared through the page cache."""
+        directory = Path(directory)
+        with open(directory / "index.json", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("format") != FEATURE_STORE_FORMAT_VERSION or index.get("columns") != FEATURE_COLUMNS:
+            raise ValueError(f"Feature store {directory} has an incompatible layout")
+        matrix = np.load(directory / "matrix.npy", mmap_mode="r" if mmap else None)
+        return cls(index["codes"], matrix)
+
+    def __getstate__(self) -> dict:
+        # Pickle the values, not the memory map
+        return {"codes": self.codes, "matrix": np.array(self.matrix)}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(list(state["codes"]), state["matrix"])
@@ -0,0 +1,108 @@
+# Sentinel AI — CPU-optimized FinBERT backend
+# Dynamic int8 quantization of the Linear layers, inputs sorted by token length so each batch is padded only
+# to its own longest headline (not 512), and the process-wide torch thread count from torch_runtime.
+# Enabled with SENTINEL_FINBERT_BACKEND=int8.
+# Run: python -m backend.ml.finbert_cpu   (prints label parity against the fp32 pipeline)
+
+import os
+import time
+
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+from backend.ml.sentiment import FINBERT_MODEL
+from backend.ml.torch_runtime import configure_torch_threads
+
+# Fixed corpus for the fp32 vs int8 parity report
+PARITY_HEADLINES = [
+    "Russia launches missile strikes on Kyiv infrastructure",
+    "Iran nuclear talks collapse as IAEA inspectors expelled",
+    "Taiwan Strait military exercises draw US Navy response",
+    "Venezuela opposition leader arrested ahead of elections",
+    "Ceasefire agreement signed between Ethiopia and rebels",
+    "Pakistan military launches offensive in tribal regions",
+    "Brazil economic growth exceeds forecasts at 3.2%",
+    "Serbia moves troops near Kosovo border amid tensions",
+    "Central bank raises interest rates to curb soaring inflation",
+    "Currency plunges to record low as foreign reserves dwindle",
+    "Oil exports resume after pipeline repairs completed",
+    "Protesters clash with police in the capital for a third night",
+    "Government and unions reach deal to end nationwide strike",
+    "Drone attack hits refinery, halting production",
+    "IMF approves new loan programme to stabilise the economy",
+    "Election results delayed amid fraud allegations",
+    "Foreign investors return as bond yields fall",
+    "Humanitarian corridor opened for civilians fleeing fighting",
+    "Sanctions tightened on state-owned energy companies",
+    "Tourism rebounds to pre-pandemic levels",
+]
+
+
+class QuantizedFinBERT:
+    """
+    Drop-in for the transformers sentiment pipeline: engine(texts, batch_size=...) -> [{label, score}].
+    Texts are tokenized once, sorted by length and run in batches padded to the batch's own maximum.
+    """
+
+    def __init__(self, model_name: str = FINBERT_MODEL, max_length: int | None = None):
+        self.max_length = max_length or int(os.getenv("SENTINEL_FINBERT_MAX_TOKENS", "64"))
+        self.num_threads = configure_torch_threads()  # process-wide; shared with the LSTM forecaster
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        self.model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.labels = [model.config.id2label[i].lower() for i in range(model.config.num_labels)]
+
+    def __call__(self, texts, batch_size: int = 32) -> list[dict]:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        if not texts:
+            return []
+        encoded = self.tokenizer(texts, truncation=True, max_length=self.max_length)["input_ids"]
+        order = np.argsort([len(ids) for ids in encoded], kind="stable")
+        out: list[dict | None] = [None] * len(texts)
+        with torch.inference_mode():
+            for start in range(0, len(order), batch_size):
+                idx = order[start : start + batch_size]
+                batch = self.tokenizer.pad({"input_ids": [encoded[i] for i in idx]}, return_tensors="pt")
+                probs = torch.softmax(self.model(**batch).logits, dim=-1)
+                scores, labels = probs.max(dim=-1)
+                for i, label, score in zip(idx, labels.tolist(), scores.tolist()):
+                    out[i] = {"label": self.labels[label], "score": float(score)}
+        return out
+
+
+def parity_report(headlines: list[str] | None = None, fp32=None, int8: QuantizedFinBERT | None = None) -> dict:
+    """Label agreement, max |score| difference and timings of the int8 engine vs the fp32 pipeline."""
+    from backend.ml.sentiment import load_fp32_pipeline
+
+    headlines = headlines or PARITY_HEADLINES
+    fp32 = fp32 or load_fp32_pipeline()
+    int8 = int8 or QuantizedFinBERT()
+    t0 = time.perf_counter()
+    reference = fp32(headlines, batch_size=len(headlines))
+    fp32_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    candidate = int8(headlines, batch_size=len(headlines))
+    int8_seconds = time.perf_counter() - t0
+    mismatches = [
+        {"headline": h, "fp32": r["label"], "int8": c["label"]}
+        for h, r, c in zip(headlines, reference, candidate)
+        if r["label"] != c["label"]
+    ]
+    return {
+        "headlines": len(headlines),
+        "label_agreement": round(1 - len(mismatches) / len(headlines), 3),
+        "max_score_diff": round(max(abs(r["score"] - c["score"]) for r, c in zip(reference, candidate)), 4),
+        "fp32_seconds": round(fp32_seconds, 3),
+        "int8_seconds": round(int8_seconds, 3),
+        "mismatches": mismatches,
+    }
+
+
+if __name__ == "__main__":
+    report = parity_report()
+    print(f"FinBERT int8 vs fp32 on {report['headlines']} headlines:")
+    print(f"  label agreement: {report['label_agreement']:.1%}  max score diff: {report['max_score_diff']}")
+    print(f"  fp32 {report['fp32_seconds']}s, int8 {report['int8_seconds']}s")
+    for m in report["mismatches"]:
+        print(f"  mismatch: {m['headline'][:60]} -> fp32 {m['fp32']}, int8 {m['int8']}")
@@ -2,6 +2,7 @@
 # 90-day sequences -> 30/60/90 day risk predictions + trend. See GitHub Issue #17.
 
 import json
+import threading
 import warnings
 from pathlib import Path
 
@@ -11,11 +12,15 @@ import torch
 import torch.nn as nn
 from torch.utils.data import Dataset, DataLoader
 
+from backend.ml.columnar import read_source
+from backend.ml.data.fetch_gdelt import gdelt_dates
 from backend.ml.pipeline import (
     FEATURE_COLUMNS,
     MONITORED_COUNTRIES,
     SentinelFeaturePipeline,
 )
+from backend.ml.registry import registry
+from backend.ml.torch_runtime import configure_torch_threads
 
 # 12 daily features for time series (issue #17)
 SEQUENCE_FEATURES = [
@@ -116,11 +121,7 @@ def _daily_gdelt_features(gdelt_df: pd.DataFrame) -> pd.DataFrame:
     if gdelt_df is None or gdelt_df.empty or "SQLDATE" not in gdelt_df.columns:
         return pd.DataFrame()
     df = gdelt_df.copy()
-    df["date"] = pd.to_datetime(
-        df["SQLDATE"].astype(str).str.replace(r"\.0$", "", regex=True),
-        format="%Y%m%d",
-        errors="coerce",
-    )
+    df["date"] = gdelt_dates(df)
     df = df.dropna(subset=["date"])
     for col in ["GoldsteinScale", "NumMentions", "AvgTone"]:
         if col in df.columns:
@@ -318,13 +319,13 @@ def build_training_sequences() -> tuple[list[np.ndarray], list[np.ndarray]]:
         gdelt_df = pd.DataFrame()
         if gdelt_path.exists():
             try:
-                gdelt_df = pd.read_csv(gdelt_path)
+                gdelt_df = read_source("gdelt", gdelt_path, prune=False)
             except Exception as e:
                 warnings.warn(f"Forecaster GDELT {code}: {e}")
         acled_df = pd.DataFrame()
         if acled_path.exists():
             try:
-                acled_df = pd.read_csv(acled_path)
+                acled_df = read_source("acled", acled_path, prune=False)
             except Exception as e:
                 warnings.warn(f"Forecaster ACLED {code}: {e}")
 
@@ -334,7 +335,7 @@ def build_training_sequences() -> tuple[list[np.ndarray], list[np.ndarray]]:
         if ucdp_path.exists():
             try:
                 from backend.ml.data.fetch_ucdp import compute_ucdp_features
-                ucdp_df = pd.read_csv(ucdp_path)
+                ucdp_df = read_source("ucdp", ucdp_path)
                 ucdp_features = compute_ucdp_features(ucdp_df, window_years=5)
             except Exception:
                 pass
@@ -448,49 +449,123 @@ def train_forecaster(
     return model
 
 
-def forecast_risk(recent_features: np.ndarray) -> dict:
+class ForecasterSession:
     """
-    Return 30/60/90 day risk forecasts and trend from last 90 days of 12 features.
-    recent_features: (90, 12) array. Returns predictions even if model was trained on synthetic data.
+    Long-lived LSTM inference session: the model is built and loaded once, kept in eval mode,
+    warmed with a dummy forward pass, and rebuilt only when models/forecaster.pt changes
+    (via the model registry). All forward passes run under torch.inference_mode().
     """
-    models_dir = _models_dir()
-    path = models_dir / "forecaster.pt"
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = RiskLSTM(
-        input_size=len(SEQUENCE_FEATURES),
-        hidden_size=128,
-        num_layers=2,
-        output_size=3,
-        dropout=0.2,
-    ).to(device)
-    if path.exists():
+
+    def __init__(self):
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.num_threads: int | None = None
+        self._fallback: RiskLSTM | None = None
+        self._lock = threading.Lock()
+
+    def _configure(self) -> None:
+        if self.num_threads is None:
+            self.num_threads = configure_torch_threads()
+
+    def _build(self) -> RiskLSTM:
+        return RiskLSTM(
+            input_size=len(SEQUENCE_FEATURES),
+            hidden_size=128,
+            num_layers=2,
+            output_size=3,
+            dropout=0.2,
+        ).to(self.device)
+
+    def _warm(self, model: RiskLSTM) -> None:
+        with torch.inference_mode():
+            model(torch.zeros((1, SEQUENCE_LEN, len(SEQUENCE_FEATURES)), device=self.device))
+
+    def _load(self, path: Path) -> RiskLSTM:
+        model = self._build()
         try:
-            model.load_state_dict(
-                torch.load(path, map_location=device, weights_only=True)
-            )
+            state = torch.load(path, map_location=self.device, weights_only=True)
         except Exception:
-            model.load_state_dict(torch.load(path, map_location=device))
-    model.eval()
-    x = np.asarray(recent_features, dtype=np.float32)
-    if x.shape != (90, 12):
-        raise ValueError(f"recent_features must be (90, 12), got {x.shape}")
-    with torch.no_grad():
-        inp = torch.from_numpy(x).unsqueeze(0).to(device)
-        preds = model(inp)[0].cpu().numpy()
-    preds = np.clip(preds, 0.0, 100.0)
-    trend = (
+            state = torch.load(path, map_location=self.device)
+        model.load_state_dict(state)
+        model.eval()
+        self._warm(model)
+        return model
+
+    def model(self) -> RiskLSTM:
+        """Current model; reloads from disk only if forecaster.pt changed since the last load."""
+        self._configure()
+        path = _repo_root() / "models" / "forecaster.pt"  # no mkdir on the hot path
+        try:
+            return registry.get("forecaster", [path], self._load).obj
+        except FileNotFoundError:
+            # No checkpoint yet: serve one randomly initialized model (as train_forecaster would save)
+            with self._lock:
+                if self._fallback is None:
+                    self._fallback = self._build().eval()
+                    self._warm(self._fallback)
+            return self._fallback
+
+    @property
+    def version(self) -> str | None:
+        entry = registry.peek("forecaster")
+        return entry.version if entry is not None else None
+
+    def warm(self) -> None:
+        """Load + warm the model now (startup) so the first request does not pay for it."""
+        self.model()
+
+    def predict(self, sequences: np.ndarray) -> np.ndarray:
+        """(N, 90, 12) float32 -> (N, 3) predictions clipped to 0-100."""
+        model = self.model()
+        with torch.inference_mode():
+            inp = torch.from_numpy(sequences).to(self.device)
+            preds = model(inp).cpu().numpy()
+        return np.clip(preds, 0.0, 100.0)
+
+
+forecaster_session = ForecasterSession()
+
+
+def _trend(preds: np.ndarray) -> str:
+    return (
         "ESCALATING"
         if preds[2] > preds[0] + 10
         else "DE-ESCALATING"
         if preds[0] > preds[2] + 10
         else "STABLE"
     )
-    return {
-        "forecast_30d": round(float(preds[0]), 1),
-        "forecast_60d": round(float(preds[1]), 1),
-        "forecast_90d": round(float(preds[2]), 1),
-        "trend": trend,
-    }
+
+
+def forecast_risk_batch(sequences: np.ndarray) -> list[dict]:
+    """
+    Forecast many countries with one forward pass.
+    sequences: (N, 90, 12) array. Returns one dict per row, same keys as forecast_risk().
+    """
+    x = np.asarray(sequences, dtype=np.float32)
+    if x.ndim != 3 or x.shape[1:] != (90, 12):
+        raise ValueError(f"sequences must be (N, 90, 12), got {x.shape}")
+    if len(x) == 0:
+        return []
+    preds = forecaster_session.predict(x)
+    return [
+        {
+            "forecast_30d": round(float(p[0]), 1),
+            "forecast_60d": round(float(p[1]), 1),
+            "forecast_90d": round(float(p[2]), 1),
+            "trend": _trend(p),
+        }
+        for p in preds
+    ]
+
+
+def forecast_risk(recent_features: np.ndarray) -> dict:
+    """
+    Return 30/60/90 day risk forecasts and trend from last 90 days of 12 features.
+    recent_features: (90, 12) array. Returns predictions even if model was trained on synthetic data.
+    """
+    x = np.asarray(recent_features, dtype=np.float32)
+    if x.shape != (90, 12):
+        raise ValueError(f"recent_features must be (90, 12), got {x.shape}")
+    return forecast_risk_batch(x[np.newaxis])[0]
 
 
 if __name__ == "__main__":
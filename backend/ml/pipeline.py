@@ -2,16 +2,27 @@
 # See GitHub Issue #11: SentinelFeaturePipeline from GDELT + ACLED + UCDP + World Bank + sentiment.
 
 import json
+import threading
 import warnings
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timezone
 
+import numpy as np
 import pandas as pd
 
 from backend.ml.data.fetch_gdelt import compute_gdelt_features
 from backend.ml.data.fetch_acled import compute_acled_features
 from backend.ml.data.fetch_ucdp import compute_ucdp_features
 from backend.ml.data.fetch_world_bank import fetch_world_bank_features
+from backend.ml.columnar import read_source
+from backend.ml.sources import (
+    DataFrameCache,
+    country_fingerprints,
+    country_source_paths,
+    dataframe_cache,
+    same_inputs,
+)
 
 # --- Exact 47 feature keys (ML Guide Section 3.2) ---
 FEATURE_COLUMNS = [
@@ -70,6 +81,14 @@ FEATURE_COLUMNS = [
     "economic_stress_score",
 ]
 
+# Count features (ints in the feature dict; everything else is float)
+INT_FEATURE_COLUMNS = frozenset({
+    "gdelt_event_count", "acled_battle_count", "acled_civilian_violence",
+    "acled_explosion_count", "acled_protest_count", "acled_event_count_90d",
+    "acled_unique_actors", "acled_geographic_spread", "ucdp_state_conflict_years",
+    "headline_volume",
+})
+
 def _load_countries() -> dict:
     """Load MONITORED_COUNTRIES from data/countries.json; fallback to original 8 if missing."""
     path = Path(__file__).resolve().parents[2] / "data" / "countries.json"
@@ -102,6 +121,10 @@ def _load_countries() -> dict:
 
 MONITORED_COUNTRIES = _load_countries()
 
+# Days of history (before each source's newest row) that compute() actually looks at:
+# GDELT 90-day window (13 weeks for weekly aggregates), ACLED 30d window + 90d counts. UCDP is read whole.
+SOURCE_LOOKBACK_DAYS = {"gdelt": 91, "acled": 90, "ucdp": None}
+
 EMPTY_SENTIMENT = {
     "finbert_negative_score": 0.0,
     "finbert_positive_score": 0.0,
@@ -113,6 +136,14 @@ EMPTY_SENTIMENT = {
 }
 
 
+def features_to_matrix(feature_dicts: list[dict]) -> np.ndarray:
+    """Stack feature dicts into an (N, 47) float64 matrix in FEATURE_COLUMNS order (missing keys -> 0)."""
+    return np.array(
+        [[d.get(col, 0) for col in FEATURE_COLUMNS] for d in feature_dicts],
+        dtype=np.float64,
+    ).reshape(len(feature_dicts), len(FEATURE_COLUMNS))
+
+
 def _repo_root() -> Path:
     """Repo root (backend/ml/pipeline.py -> parents[2])."""
     return Path(__file__).resolve().parents[2]
@@ -193,12 +224,7 @@ class SentinelFeaturePipeline:
         f.update(derived)
 
         # Ensure exactly FEATURE_COLUMNS; no None; types int or float
-        int_keys = {
-            "gdelt_event_count", "acled_battle_count", "acled_civilian_violence",
-            "acled_explosion_count", "acled_protest_count", "acled_event_count_90d",
-            "acled_unique_actors", "acled_geographic_spread", "ucdp_state_conflict_years",
-            "headline_volume",
-        }
+        int_keys = INT_FEATURE_COLUMNS
         out = {}
         for k in FEATURE_COLUMNS:
             v = f.get(k)
@@ -236,94 +262,168 @@ class SentinelFeaturePipeline:
         }
 
     @classmethod
-    def compute_all_countries(cls, limit: int | None = None) -> dict[str, dict]:
+    def compute_for_country(cls, code: str, info: dict | None = None, frames: DataFrameCache | None = None) -> dict:
+        """
+        Load GDELT/ACLED/UCDP/World Bank data from disk for one country and return its feature dict.
+        Only the columns and days compute() uses are read (SOURCE_LOOKBACK_DAYS) when a columnar copy exists.
+        With frames set, reads go through that DataFrame cache (API process); refresh workers read directly.
+        Graceful fallbacks: missing CSVs/JSON yield empty DataFrames or zero-filled dicts.
+        """
+        info = info or MONITORED_COUNTRIES[code]
+        name = info["name"]
+        iso3 = info["iso3"]
+        paths = country_source_paths(code, info)
+
+        def read_csv(source: str, label: str) -> pd.DataFrame:
+            path = paths[source]
+            if path is None:
+                return pd.DataFrame()
+            try:
+                lookback = SOURCE_LOOKBACK_DAYS[source]
+                if frames is not None:
+                    return frames.read(source, path, lookback_days=lookback)
+                return read_source(source, path, lookback_days=lookback)
+            except Exception as e:
+                warnings.warn(f"{label} {code}: {e}")
+                return pd.DataFrame()
+
+        # GDELT, ACLED (same safe name as fetch_acled_all_countries), UCDP GED
+        gdelt_df = read_csv("gdelt", "GDELT")
+        acled_df = read_csv("acled", "ACLED")
+        ucdp_df = read_csv("ucdp", "UCDP")
+
+        # Load World Bank
+        wb_path = paths["world_bank"]
+        if wb_path is not None:
+            try:
+                with open(wb_path, encoding="utf-8") as f:
+                    payload = json.load(f)
+                wb_features = payload.get("features", {})
+            except Exception as e:
+                warnings.warn(f"World Bank {code}: {e}")
+                wb_features = {}
+        else:
+            try:
+                wb_features = fetch_world_bank_features(iso3)
+            except Exception as e:
+                warnings.warn(f"World Bank {code}: {e}")
+                wb_features = {}
+
+        pipeline = cls(code, name)
+        try:
+            return pipeline.compute(gdelt_df, acled_df, ucdp_df, wb_features)
+        except Exception as e:
+            warnings.warn(f"Pipeline {code}: {e}")
+            zero_feat = {k: (0 if k in INT_FEATURE_COLUMNS else 0.0) for k in FEATURE_COLUMNS}
+            zero_feat["country_code"] = code
+            zero_feat["computed_at"] = datetime.now(tz=timezone.utc).isoformat()
+            return zero_feat
+
+    @classmethod
+    def compute_all_countries(cls, limit: int | None = None, codes: list[str] | None = None) -> dict[str, dict]:
         """
         Load data from disk for monitored countries and return {country_code: feature_dict}.
         If limit is set (e.g. 15), only the first `limit` countries are processed (faster startup).
+        If codes is set, only those countries are processed (used by the refresh worker pool to fan out).
         Graceful fallbacks: missing CSVs/JSON yield empty DataFrames or zero-filled dicts.
         """
-        root = _repo_root()
-        data_gdelt = root / "data" / "gdelt"
-        data_acled = root / "data" / "acled"
-        data_ucdp = root / "data" / "ucdp"
-        data_wb = root / "data" / "world_bank"
-        results = {}
         items = list(MONITORED_COUNTRIES.items())
+        if codes is not None:
+            wanted = set(codes)
+            items = [(code, info) for code, info in items if code in wanted]
         if limit is not None:
             items = items[:limit]
+        return {code: cls.compute_for_country(code, info) for code, info in items}
 
-        for code, info in items:
-            name = info["name"]
-            iso3 = info["iso3"]
-            acled_name = info["acled_name"]
-
-            # Load GDELT
-            gdelt_path = data_gdelt / f"{code}_events.csv"
-            if gdelt_path.exists():
-                try:
-                    gdelt_df = pd.read_csv(gdelt_path)
-                except Exception as e:
-                    warnings.warn(f"GDELT {code}: {e}")
-                    gdelt_df = pd.DataFrame()
-            else:
-                gdelt_df = pd.DataFrame()
-
-            # Load ACLED (same safe name as fetch_acled_all_countries)
-            _acled_safe = acled_name.lower().replace(" ", "_").replace("(", "").replace(")", "").replace("'", "").replace("-", "_").replace("__", "_")
-            acled_path = data_acled / f"{_acled_safe}.csv"
-            if acled_path.exists():
-                try:
-                    acled_df = pd.read_csv(acled_path)
-                except Exception as e:
-                    warnings.warn(f"ACLED {code}: {e}")
-                    acled_df = pd.DataFrame()
-            else:
-                acled_df = pd.DataFrame()
-
-            # Load UCDP GED
-            safe = acled_name.lower().replace(" ", "_").replace("(", "").replace(")", "").replace("__", "_") + "_ged.csv"
-            ucdp_path = data_ucdp / safe
-            if not ucdp_path.exists():
-                # Try alternate (e.g. ukraine vs Ukraine)
-                alt = list(data_ucdp.glob(f"*{name.split()[0].lower()}*ged*.csv"))
-                ucdp_path = Path(alt[0]) if alt else None
-            if ucdp_path and Path(ucdp_path).exists():
-                try:
-                    ucdp_df = pd.read_csv(ucdp_path)
-                except Exception as e:
-                    warnings.warn(f"UCDP {code}: {e}")
-                    ucdp_df = pd.DataFrame()
-            else:
-                ucdp_df = pd.DataFrame()
-
-            # Load World Bank
-            wb_path = data_wb / f"{iso3}.json"
-            if wb_path.exists():
-                try:
-                    with open(wb_path, encoding="utf-8") as f:
-                        payload = json.load(f)
-                    wb_features = payload.get("features", {})
-                except Exception as e:
-                    warnings.warn(f"World Bank {code}: {e}")
-                    wb_features = {}
-            else:
-                try:
-                    wb_features = fetch_world_bank_features(iso3)
-                except Exception as e:
-                    warnings.warn(f"World Bank {code}: {e}")
-                    wb_features = {}
-
-            pipeline = cls(code, name)
-            try:
-                results[code] = pipeline.compute(gdelt_df, acled_df, ucdp_df, wb_features)
-            except Exception as e:
-                warnings.warn(f"Pipeline {code}: {e}")
-                zero_feat = {k: (0 if k in ("gdelt_event_count", "acled_battle_count", "acled_civilian_violence", "acled_explosion_count", "acled_protest_count", "acled_event_count_90d", "acled_unique_actors", "acled_geographic_spread", "ucdp_state_conflict_years", "headline_volume") else 0.0) for k in FEATURE_COLUMNS}
-                zero_feat["country_code"] = code
-                zero_feat["computed_at"] = datetime.now(tz=timezone.utc).isoformat()
-                results[code] = zero_feat
 
-        return results
+def compute_features_chunk(codes: list[str], previous_inputs: dict[str, dict] | None = None) -> dict:
+    """
+    Feature-pool task: fingerprint each country's input files and run the 47-feature pipeline only for
+    countries whose inputs differ from previous_inputs ({code: fingerprints} from the last snapshot).
+    Lives here rather than in refresh.py so feature workers never import xgboost, sklearn or torch.
+    Returns {"features": {code: features}, "inputs": {code: fingerprints}, "unchanged": [codes]}.
+    """
+    previous_inputs = previous_inputs or {}
+    out = {"features": {}, "inputs": {}, "unchanged": []}
+    for code in codes:
+        info = MONITORED_COUNTRIES[code]
+        inputs = country_fingerprints(code, info, previous_inputs.get(code))
+        out["inputs"][code] = inputs
+        if same_inputs(inputs, previous_inputs.get(code)):
+            out["unchanged"].append(code)
+        else:
+            out["features"][code] = SentinelFeaturePipeline.compute_for_country(code, info)
+    return out
+
+
+def with_sentiment(features: dict, finbert_results: dict | None) -> dict:
+    """
+    Copy of a feature dict with only the 7 sentiment features replaced (same defaults/coercion as compute()).
+    Derived features do not depend on sentiment, so nothing else needs recomputing.
+    """
+    out = dict(features)
+    sentiment = finbert_results or {}
+    for k, default in EMPTY_SENTIMENT.items():
+        v = sentiment.get(k)
+        if v is None:
+            v = default
+        out[k] = _safe_int(v) if k == "headline_volume" else _safe_float(v)
+    return out
+
+
+class FeatureCache:
+    """
+    Per-country feature dicts keyed by country + input file fingerprints (see sources.py).
+    Seeded from every published score snapshot and filled on demand, so /api/risk-score reuses
+    the precompute's work and only recomputes when a country's source files changed.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, dict]] = OrderedDict()  # code -> (inputs, features)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, code: str, inputs: dict | None, features: dict) -> None:
+        if not inputs:
+            return
+        with self._lock:
+            self._entries[code] = (inputs, dict(features))
+            self._entries.move_to_end(code)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def seed(self, scores: dict[str, dict], store) -> None:
+        """Load a snapshot's entries ({code: entry with "inputs"}) and its FeatureStore."""
+        if store is None:
+            return
+        for code, entry in scores.items():
+            if code not in store:
+                continue
+            features = store.features(code)
+            features["anomaly_score"] = 0.0  # pipeline value, before the refresh's anomaly overlay
+            self.put(code, entry.get("inputs"), features)
+
+    def compute(self, code: str, info: dict | None = None) -> dict:
+        """Features for one country: cached copy if its input files are unchanged, else recompute from disk."""
+        info = info or MONITORED_COUNTRIES[code]
+        cached = self._entries.get(code)
+        inputs = country_fingerprints(code, info, cached[0] if cached else None)
+        if cached is not None and same_inputs(inputs, cached[0]):
+            self.hits += 1
+            self.put(code, inputs, cached[1])  # keep the fresh mtimes so a touched file is hashed once, not per request
+            return dict(cached[1])
+        self.misses += 1
+        features = SentinelFeaturePipeline.compute_for_country(code, info, frames=dataframe_cache)
+        self.put(code, inputs, features)
+        return dict(features)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+feature_cache = FeatureCache()
 
 
 if __name__ == "__main__":
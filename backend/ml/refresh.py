@@ -0,0 +1,357 @@
+# Sentinel AI — score refresh workers
+# The 15-minute refresh (features -> risk -> anomaly -> forecast) runs here, in worker processes,
+# so pandas/XGBoost/sklearn/torch work never executes on the API event loop.
+# Feature computation fans out across a pool (its task, pipeline.compute_features_chunk, imports no model
+# libraries); scoring runs in one long-lived worker that keeps models warm.
+
+import math
+import multiprocessing
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
+
+from backend.ml.feature_store import FeatureStore
+from backend.ml.risk_scorer import level_from_score, load_risk_scorer, predict_risk_batch
+from backend.ml.anomaly import detect_anomaly_batch, model_bank
+from backend.ml.forecaster import forecast_risk_batch, forecaster_session
+
+
+@dataclass(frozen=True)
+class ScoreSnapshot:
+    """
+    One complete, immutable refresh result. Built off to the side and published by swapping a single
+    module-level reference, so readers always see either the old or the new snapshot — never a mix.
+    """
+
+    version: int
+    computed_at: str
+    scores: Mapping[str, dict]
+    summary: dict
+    metadata: dict = field(default_factory=dict)
+    stale: bool = False  # True when loaded from disk at startup and not yet recomputed
+    features: FeatureStore | None = None  # every country's features (with the anomaly overlay), row per code
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        scores: dict[str, dict],
+        summary: dict,
+        metadata: dict | None = None,
+        features: FeatureStore | None = None,
+    ) -> "ScoreSnapshot":
+        return cls(
+            version=version,
+            computed_at=summary.get("computedAt") or datetime.utcnow().isoformat() + "Z",
+            scores=MappingProxyType(dict(scores)),
+            summary=dict(summary, snapshotVersion=version, stale=False),
+            metadata=dict(metadata or {}),
+            features=features,
+        )
+
+    def features_for(self, code: str) -> dict:
+        """One country's feature dict from the store ({} if not scored)."""
+        return self.features.features(code) if self.features is not None else {}
+
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+def default_snapshot_path() -> Path:
+    """data/cache/score_snapshot.pkl at repo root."""
+    return Path(__file__).resolve().parents[2] / "data" / "cache" / "score_snapshot.pkl"
+
+
+def save_snapshot(snapshot: ScoreSnapshot, path: Path | None = None) -> Path:
+    """
+    Persist a snapshot (scores incl. forecasts and input fingerprints, feature store, summary, metadata)
+    as one binary pickle. Written to a temp file and renamed, so a crash never leaves a torn file.
+    """
+    path = Path(path or default_snapshot_path())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": SNAPSHOT_FORMAT_VERSION,
+        "version": snapshot.version,
+        "computed_at": snapshot.computed_at,
+        "scores": dict(snapshot.scores),
+        "summary": snapshot.summary,
+        "metadata": snapshot.metadata,
+        "features": snapshot.features,
+    }
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def load_snapshot(path: Path | None = None) -> ScoreSnapshot | None:
+    """Last persisted snapshot, marked stale; None if missing, unreadable or from another format version."""
+    path = Path(path or default_snapshot_path())
+    if not path.exists():
+        return None
+    try:
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+    except Exception as e:
+        print(f"  Warning: could not load score snapshot {path}: {e}")
+        return None
+    if not isinstance(payload, dict) or payload.get("format") != SNAPSHOT_FORMAT_VERSION:
+        return None
+    return ScoreSnapshot(
+        version=payload["version"],
+        computed_at=payload["computed_at"],
+        scores=MappingProxyType(payload["scores"]),
+        summary=dict(payload["summary"], stale=True),
+        metadata=payload.get("metadata", {}),
+        stale=True,
+        features=payload.get("features"),
+    )
+
+
+def refresh_workers() -> int:
+    """Feature worker count: SENTINEL_REFRESH_WORKERS, else one per core."""
+    env = os.getenv("SENTINEL_REFRESH_WORKERS")
+    return max(1, int(env)) if env else max(1, os.cpu_count() or 1)
+
+
+_scoring_models: dict[str, dict] = {}  # scoring worker only: warm state per model, returned with every score run
+
+
+def _warm_scoring_model(name: str, load, optional: tuple = ()) -> None:
+    t0 = time.perf_counter()
+    try:
+        load()
+    except Exception as e:
+        _scoring_models[name] = {"state": "failed", "seconds": round(time.perf_counter() - t0, 3), "error": str(e)}
+        if not isinstance(e, optional):
+            raise
+        return
+    _scoring_models[name] = {"state": "ready", "seconds": round(time.perf_counter() - t0, 3), "error": None}
+
+
+def _init_scoring_worker() -> None:
+    """Load and warm every model once when the scoring process starts."""
+    _warm_scoring_model("risk_scorer", load_risk_scorer, optional=(FileNotFoundError,))
+    _warm_scoring_model("anomaly", model_bank.preload)
+    _warm_scoring_model("forecaster", forecaster_session.warm)
+
+
+def create_pools() -> tuple[ProcessPoolExecutor, ProcessPoolExecutor]:
+    """
+    (feature_pool, scoring_pool). Spawned, not forked: the API process may already hold
+    torch/OpenMP threads, which are not fork-safe.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    feature_pool = ProcessPoolExecutor(max_workers=refresh_workers(), mp_context=ctx)
+    scoring_pool = ProcessPoolExecutor(max_workers=1, mp_context=ctx, initializer=_init_scoring_worker)
+    return feature_pool, scoring_pool
+
+
+def chunk_codes(codes: list[str], n_chunks: int) -> list[list[str]]:
+    """Split country codes into at most n_chunks contiguous, non-empty chunks."""
+    if not codes:
+        return []
+    size = math.ceil(len(codes) / max(n_chunks, 1))
+    return [codes[i : i + size] for i in range(0, len(codes), size)]
+
+
+def base_features(features: dict) -> dict:
+    """Copy of a stored feature dict as the pipeline produced it (anomaly_score before the anomaly overlay)."""
+    return dict(features, anomaly_score=0.0)
+
+
+def _anomaly_input_from_features(features: dict) -> dict:
+    """Map pipeline feature names to ANOMALY_FEATURES keys."""
+    return {
+        "goldstein_mean": features.get("gdelt_goldstein_mean", 0),
+        "goldstein_std": features.get("gdelt_goldstein_std", 0),
+        "goldstein_min": features.get("gdelt_goldstein_min", 0),
+        "mentions_total": features.get("gdelt_event_count", 0),
+        "avg_tone": features.get("gdelt_avg_tone", 0),
+        "event_count": features.get("gdelt_event_count", 0),
+    }
+
+
+def _build_forecast_sequence(features: dict) -> np.ndarray:
+    """Build (90, 12) array from pipeline features for LSTM (repeat current row 90 times)."""
+    risk = min(100.0, max(0.0, float(features.get("political_risk_score", features.get("conflict_composite", 0)))))
+    row = [
+        risk,
+        float(features.get("gdelt_goldstein_mean", 0)),
+        float(features.get("gdelt_event_count", 0)),
+        float(features.get("acled_fatalities_30d", 0)),
+        float(features.get("acled_battle_count", 0)),
+        float(features.get("finbert_negative_score", 0)),
+        float(features.get("wb_gdp_growth_latest", 0)),
+        float(features.get("anomaly_score", 0)),
+        float(features.get("gdelt_avg_tone", 0)),
+        float(features.get("gdelt_event_acceleration", 0)),
+        float(features.get("ucdp_conflict_intensity", 0)),
+        float(features.get("econ_composite_score", 0)),
+    ]
+    return np.array([row] * 90, dtype=np.float32)
+
+
+def refresh_time_budget() -> float:
+    """Seconds the feature stage may take before late chunks are carried forward (SENTINEL_REFRESH_BUDGET_S, default 10)."""
+    return float(os.getenv("SENTINEL_REFRESH_BUDGET_S", "10"))
+
+
+def _model_versions(codes: list[str]) -> dict[str, dict]:
+    """{code: {"risk", "anomaly", "forecast"}} versions of the models that would score each country now."""
+    try:
+        risk_version = load_risk_scorer().version
+    except FileNotFoundError:
+        risk_version = None
+    forecaster_session.model()
+    forecast_version = forecaster_session.version
+    versions = {}
+    for code in codes:
+        detector = model_bank.get(code)
+        versions[code] = {
+            "risk": risk_version,
+            "anomaly": detector.version if detector is not None else None,
+            "forecast": forecast_version,
+        }
+    return versions
+
+
+def score_countries(
+    items: list[tuple[str, str]],
+    features: FeatureStore | Path,
+    inputs: dict[str, dict] | None = None,
+    previous_scores: dict[str, dict] | None = None,
+    changed: set[str] | None = None,
+) -> tuple[dict[str, dict], dict[str, float], dict[str, dict]]:
+    """
+    Worker task: batched risk, anomaly and forecast for (code, name) items.
+    features is the refresh's FeatureStore, or the directory it was saved to (memory-mapped here, no copy).
+    Countries not in `changed` whose previous entry was scored by the same model versions are carried
+    forward from previous_scores unchanged; only the rest go through the models.
+    Returns ({code: {riskScore, riskLevel, isAnomaly, anomalyScore, severity, computedAt,
+    name, risk_prediction, anomaly, forecast, inputs, modelVersions}} in items order, {stage: seconds},
+    {model: warm state} of this scoring worker).
+    """
+    store = features if isinstance(features, FeatureStore) else FeatureStore.load(features)
+    inputs = inputs or {}
+    previous_scores = previous_scores or {}
+    timings = {}
+    versions = _model_versions([code for code, _ in items])
+    carried = {}
+    if changed is not None:
+        for code, _ in items:
+            prev = previous_scores.get(code)
+            if code not in changed and prev is not None and prev.get("modelVersions") == versions[code]:
+                # Fresh fingerprints: a touched-but-identical file must not be re-hashed on every refresh
+                carried[code] = dict(prev, inputs=inputs.get(code, prev.get("inputs")))
+    all_items = items
+    items = [(code, name) for code, name in items if code not in carried]
+
+    t0 = time.perf_counter()
+    # One booster call for every country, straight from the float32 matrix
+    codes = [code for code, _ in items]
+    features_list = [store.features(code) for code in codes]
+    try:
+        predictions = predict_risk_batch(store.rows(codes))
+    except FileNotFoundError:
+        predictions = [
+            {
+                "risk_level": "LOW",
+                "risk_score": 0,
+                "confidence": 0.5,
+                "probabilities": {},
+                "top_drivers": [],
+                "model_version": None,
+            }
+            for _ in items
+        ]
+    timings["risk"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    # One scaling pass + one score_samples pass per country model
+    anomalies = detect_anomaly_batch(
+        [code for code, _ in items],
+        [_anomaly_input_from_features(features) for features in features_list],
+    )
+    for features, anomaly in zip(features_list, anomalies):
+        features["anomaly_score"] = anomaly["anomaly_score"]
+    timings["anomaly"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    # 30/60/90-day forecasts for every country in one (N, 90, 12) LSTM pass
+    forecasts = forecast_risk_batch(
+        np.stack([_build_forecast_sequence(features) for features in features_list])
+        if features_list
+        else np.zeros((0, 90, 12), dtype=np.float32)
+    )
+    timings["forecast"] = time.perf_counter() - t0
+
+    scores = {}
+    for (code, name), pred, anomaly, forecast in zip(items, predictions, anomalies, forecasts):
+        risk_score = pred["risk_score"]
+        risk_level = pred["risk_level"]
+        if anomaly["is_anomaly"]:
+            risk_score = min(100, risk_score + int(anomaly["anomaly_score"] * 15))
+            risk_level = level_from_score(risk_score)
+            pred = dict(pred, risk_score=risk_score, risk_level=risk_level)
+
+        scores[code] = {
+            "riskScore": risk_score,
+            "riskLevel": risk_level,
+            "isAnomaly": anomaly["is_anomaly"],
+            "anomalyScore": anomaly["anomaly_score"],
+            "severity": anomaly["severity"],
+            "computedAt": datetime.utcnow().isoformat() + "Z",
+            "name": name,
+            "risk_prediction": pred,
+            "anomaly": anomaly,
+            "forecast": forecast,
+            "inputs": inputs.get(code),
+            "modelVersions": versions[code],
+        }
+    return {code: scores.get(code) or carried[code] for code, _ in all_items}, timings, dict(_scoring_models)
+
+
+def build_dashboard_summary(country_scores: dict[str, dict], previous_summary: dict, model_health: float) -> dict:
+    """Dashboard KPIs over all scored countries; deltas are relative to previous_summary."""
+    country_rows = [
+        {
+            "code": code,
+            "name": c["name"],
+            "riskScore": c["riskScore"],
+            "riskLevel": c["riskLevel"],
+            "isAnomaly": c["isAnomaly"],
+            "anomalyScore": c["anomalyScore"],
+        }
+        for code, c in country_scores.items()
+    ]
+    risk_scores = [r["riskScore"] for r in country_rows]
+    global_threat_index = round(sum(risk_scores) / len(risk_scores)) if risk_scores else 0
+    prev_gti = previous_summary.get("globalThreatIndex", global_threat_index)
+
+    active_anomalies = sum(1 for r in country_rows if r["isAnomaly"])
+    high_plus_countries = sum(1 for r in country_rows if r["riskLevel"] in ("HIGH", "CRITICAL"))
+    prev_high = previous_summary.get("highPlusCountries", high_plus_countries)
+
+    escalation_alerts_24h = sum(1 for r in country_rows if r["anomalyScore"] > 0.5)
+    countries_sorted = sorted(country_rows, key=lambda r: r["riskScore"], reverse=True)
+    return {
+        "globalThreatIndex": global_threat_index,
+        "globalThreatIndexDelta": global_threat_index - prev_gti,
+        "activeAnomalies": active_anomalies,
+        "highPlusCountries": high_plus_countries,
+        "highPlusCountriesDelta": high_plus_countries - prev_high,
+        "escalationAlerts24h": escalation_alerts_24h,
+        "modelHealth": model_health,
+        "countries": countries_sorted,
+        "computedAt": datetime.utcnow().isoformat() + "Z",
+    }
@@ -0,0 +1,152 @@
+# Sentinel AI — in-process model registry
+# Loads each model artifact once, keeps it in memory, and hot-swaps it when the file on disk
+# changes (retrain). Every load carries a content-hash version so predictions can report it.
+
+import hashlib
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+
+def file_signature(path: Path) -> tuple[int, int]:
+    """(mtime_ns, size) of a file — a cheap stat used to notice a retrained artifact."""
+    st = Path(path).stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def content_hash(paths: list[Path], chunk_size: int = 1 << 20) -> str:
+    """Short sha256 over the bytes of all paths (in order). Used as the model version."""
+    h = hashlib.sha256()
+    for p in paths:
+        with open(p, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """One immutable registry entry. A reload builds a new entry and swaps the reference."""
+
+    name: str
+    obj: Any
+    version: str
+    signature: tuple
+    loaded_at: float
+    load_seconds: float
+    size_bytes: int = 0
+
+
+class ModelRegistry:
+    """
+    Cache of loaded model artifacts keyed by name.
+    get() stats the artifact files on every call (microseconds) and reloads only when
+    mtime/size changed. If the bytes are unchanged (e.g. touched), the loaded object is kept.
+    Readers never see a half-loaded model: the new entry is published with a single dict assignment.
+    With max_bytes set, entries are kept in LRU order and the least recently used are evicted
+    once the summed artifact size exceeds the budget (the newest entry is always kept).
+    """
+
+    def __init__(self, max_bytes: int | None = None):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, LoadedModel] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.evictions = 0
+
+    def get(self, name: str, paths: list[Path], loader: Callable[..., Any]) -> LoadedModel:
+        """
+        Return the cached entry for name, (re)loading via loader(*paths) if the files changed.
+        Raises FileNotFoundError if any path is missing and nothing is cached.
+        """
+        paths = [Path(p) for p in paths]
+        try:
+            signature = tuple(file_signature(p) for p in paths)
+        except FileNotFoundError:
+            entry = self._entries.get(name)
+            if entry is None:
+                raise
+            return entry  # file being replaced right now; keep serving the current model
+        entry = self._entries.get(name)
+        if entry is not None and entry.signature == signature:
+            if self.max_bytes is not None:
+                self._touch(name)
+            return entry
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.signature == signature:
+                return entry
+            return self._load(name, paths, signature, loader, entry)
+
+    def _touch(self, name: str) -> None:
+        with self._lock:
+            if name in self._entries:
+                self._entries.move_to_end(name)
+
+    def _load(self, name: str, paths: list[Path], signature: tuple, loader, current: LoadedModel | None) -> LoadedModel:
+        t0 = time.perf_counter()
+        try:
+            version = content_hash(paths)
+            if current is not None and current.version == version:
+                obj = current.obj
+            else:
+                obj = loader(*paths)
+        except Exception as e:
+            if current is None:
+                raise
+            warnings.warn(f"Model registry: reload of {name} failed, keeping {current.version}: {e}")
+            return current
+        entry = LoadedModel(
+            name=name,
+            obj=obj,
+            version=version,
+            signature=signature,
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - t0,
+            size_bytes=sum(size for _, size in signature),
+        )
+        self._bytes += entry.size_bytes - (current.size_bytes if current is not None else 0)
+        self._entries[name] = entry
+        self._entries.move_to_end(name)
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until within max_bytes (caller holds the lock)."""
+        if self.max_bytes is None:
+            return
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old.size_bytes
+            self.evictions += 1
+
+    def peek(self, name: str) -> LoadedModel | None:
+        """Currently cached entry (no stat, no load)."""
+        return self._entries.get(name)
+
+    def invalidate(self, name: str) -> None:
+        """Drop an entry; the next get() reloads from disk."""
+        with self._lock:
+            old = self._entries.pop(name, None)
+            if old is not None:
+                self._bytes -= old.size_bytes
+
+    def versions(self) -> dict[str, str]:
+        """{name: version} for every loaded model (for /health and logging)."""
+        return {name: e.version for name, e in list(self._entries.items())}
+
+    def stats(self) -> dict:
+        """Entry count, resident artifact bytes, budget and evictions."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+registry = ModelRegistry()
@@ -16,8 +16,10 @@ from sklearn.preprocessing import LabelEncoder
 
 from collections import Counter
 
-from backend.ml.pipeline import FEATURE_COLUMNS, MONITORED_COUNTRIES
-from backend.ml.data.fetch_gdelt import compute_gdelt_features
+from backend.ml.pipeline import FEATURE_COLUMNS, MONITORED_COUNTRIES, features_to_matrix
+from backend.ml.registry import LoadedModel, registry
+from backend.ml.columnar import read_source
+from backend.ml.data.fetch_gdelt import compute_gdelt_features, gdelt_dates
 from backend.ml.data.fetch_ucdp import compute_ucdp_features
 
 RISK_LABELS = ["LOW", "MODERATE", "ELEVATED", "HIGH", "CRITICAL"]
@@ -56,6 +58,27 @@ def level_from_score(score: int) -> str:
     return "LOW"
 
 
+# Score thresholds (lower bound, level) for level_from_score, highest first
+LEVEL_THRESHOLDS = [(81, "CRITICAL"), (61, "HIGH"), (41, "ELEVATED"), (21, "MODERATE")]
+
+
+def scores_from_probabilities(probabilities: np.ndarray, labels: list) -> np.ndarray:
+    """Vectorized score_from_probabilities: (N, n_classes) -> (N,) int scores 0-100."""
+    weights = np.array([CLASS_WEIGHTS.get(str(label), 0) for label in labels], dtype=np.float64)
+    raw = np.asarray(probabilities, dtype=np.float64) @ weights
+    return np.clip(np.rint(raw), 0, 100).astype(int)
+
+
+def levels_from_scores(scores: np.ndarray) -> np.ndarray:
+    """Vectorized level_from_score (same thresholds)."""
+    scores = np.asarray(scores)
+    return np.select(
+        [scores >= lo for lo, _ in LEVEL_THRESHOLDS],
+        [level for _, level in LEVEL_THRESHOLDS],
+        default="LOW",
+    )
+
+
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
@@ -205,7 +228,7 @@ def _load_country_auxiliary_features(root: Path, code: str, info: dict) -> dict:
                 ucdp_path = candidates[0]
     if ucdp_path.exists():
         try:
-            ucdp_df = pd.read_csv(ucdp_path)
+            ucdp_df = read_source("ucdp", ucdp_path)
             out.update(compute_ucdp_features(ucdp_df))
         except Exception:
             pass
@@ -243,7 +266,7 @@ def build_training_dataset() -> pd.DataFrame:
         if not acled_path.exists():
             continue
         try:
-            acled_df = pd.read_csv(acled_path)
+            acled_df = read_source("acled", acled_path, prune=False)
         except Exception as e:
             warnings.warn(f"ACLED {code} read failed: {e}")
             continue
@@ -260,9 +283,9 @@ def build_training_dataset() -> pd.DataFrame:
         gdelt_path = root / "data" / "gdelt" / f"{code}_events.csv"
         if gdelt_path.exists():
             try:
-                gdelt_df = pd.read_csv(gdelt_path)
+                gdelt_df = read_source("gdelt", gdelt_path, prune=False)
                 gdelt_df.columns = gdelt_df.columns.str.strip()
-                gdelt_df["date"] = pd.to_datetime(gdelt_df["SQLDATE"].astype(str), format="%Y%m%d", errors="coerce")
+                gdelt_df["date"] = gdelt_dates(gdelt_df)
                 gdelt_df = gdelt_df.dropna(subset=["date"])
             except Exception:
                 gdelt_df = None
@@ -394,52 +417,82 @@ def train_risk_scorer(training_df: pd.DataFrame):
     return model
 
 
-def predict_risk(features: dict) -> dict:
+def _load_scorer_artifacts(model_path: Path, encoder_path: Path) -> dict:
+    """Unpickle booster + label encoder once; precompute the (input-independent) top drivers."""
+    model = joblib.load(model_path)
+    le = joblib.load(encoder_path)
+    top_features = sorted(
+        zip(FEATURE_COLUMNS, model.feature_importances_), key=lambda x: -x[1]
+    )[:5]
+    return {
+        "model": model,
+        "encoder": le,
+        "top_drivers": [str(f) for f, _ in top_features],
+    }
+
+
+def load_risk_scorer() -> LoadedModel:
     """
-    Load trained model and predict risk from a 47-feature dict (e.g. from SentinelFeaturePipeline.compute()).
-    Returns dict with risk_level, risk_score (0-100), confidence, probabilities, top_drivers (5 names).
-    risk_level is always derived from risk_score thresholds so they never contradict.
+    Registry entry for the XGBoost scorer (loaded once, hot-reloaded when the .pkl files change).
+    entry.obj is {"model", "encoder", "top_drivers"}; entry.version identifies the artifact.
     """
     root = _repo_root()
     model_path = root / "models" / "risk_scorer.pkl"
     encoder_path = root / "models" / "risk_label_encoder.pkl"
-    if not model_path.exists() or not encoder_path.exists():
+    if registry.peek("risk_scorer") is None and (not model_path.exists() or not encoder_path.exists()):
         raise FileNotFoundError("Train the risk scorer first: python -m backend.ml.risk_scorer")
+    return registry.get("risk_scorer", [model_path, encoder_path], _load_scorer_artifacts)
 
-    model = joblib.load(model_path)
-    le = joblib.load(encoder_path)
 
-    X = pd.DataFrame([{col: features.get(col, 0) for col in FEATURE_COLUMNS}])
-    probabilities = model.predict_proba(X)[0]
-    # Ordered labels matching probabilities array (model/encoder order)
-    labels = list(le.inverse_transform(range(len(probabilities))))
+def predict_risk_batch(feature_matrix: np.ndarray) -> list[dict]:
+    """
+    Score many countries with one booster call.
+    feature_matrix: (N, 47) array in FEATURE_COLUMNS order (FeatureStore rows or pipeline.features_to_matrix).
+    Returns one dict per row, same keys and values as predict_risk().
+    """
+    scorer = load_risk_scorer()
+    model = scorer.obj["model"]
+    le = scorer.obj["encoder"]
+
+    X = np.asarray(feature_matrix, dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS))
+    if len(X) == 0:
+        return []
+    probabilities = model.predict_proba(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+    # Ordered labels matching probabilities columns (model/encoder order)
+    labels = [str(label) for label in le.inverse_transform(range(probabilities.shape[1]))]
 
-    # Weighted score from all class probabilities — semantically aligned with distribution
-    risk_score = score_from_probabilities(probabilities.tolist(), labels)
-    # Level derived from score — ALWAYS consistent
-    risk_level = level_from_score(risk_score)
+    # Weighted score from all class probabilities; level derived from score — ALWAYS consistent
+    risk_scores = scores_from_probabilities(probabilities, labels)
+    risk_levels = levels_from_scores(risk_scores)
 
     # Confidence = probability of the derived level's class
-    level_idx = labels.index(risk_level) if risk_level in labels else 0
-    confidence = float(probabilities[level_idx])
+    label_idx = {label: i for i, label in enumerate(labels)}
+    level_idx = np.array([label_idx.get(level, 0) for level in risk_levels], dtype=int)
+    confidences = probabilities[np.arange(len(X)), level_idx]
+
+    top_drivers = scorer.obj["top_drivers"]
+    return [
+        {
+            "risk_level": str(risk_levels[i]),
+            "risk_score": int(risk_scores[i]),
+            "confidence": round(float(confidences[i]), 3),
+            "probabilities": {labels[j]: round(float(probabilities[i, j]), 3) for j in range(len(labels))},
+            "top_drivers": list(top_drivers),
+            "model_version": scorer.version,
+        }
+        for i in range(len(X))
+    ]
 
-    importance = model.feature_importances_
-    top_features = sorted(
-        zip(FEATURE_COLUMNS, importance), key=lambda x: -x[1]
-    )[:5]
-    top_drivers = [str(f) for f, _ in top_features]
 
-    proba_dict = {
-        str(labels[i]): round(float(probabilities[i]), 3)
-        for i in range(len(probabilities))
-    }
-    return {
-        "risk_level": risk_level,
-        "risk_score": risk_score,
-        "confidence": round(confidence, 3),
-        "probabilities": proba_dict,
-        "top_drivers": top_drivers,
-    }
+def predict_risk(features: dict) -> dict:
+    """
+    Predict risk from a 47-feature dict (e.g. from SentinelFeaturePipeline.compute()) with the cached model.
+    Returns dict with risk_level, risk_score (0-100), confidence, probabilities, top_drivers (5 names),
+    model_version (registry version of the artifact that served the prediction).
+    risk_level is always derived from risk_score thresholds so they never contradict.
+    Single-row case of predict_risk_batch, so both paths always agree.
+    """
+    return predict_risk_batch(features_to_matrix([features]))[0]
 
 
 if __name__ == "__main__":
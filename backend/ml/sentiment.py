@@ -1,54 +1,223 @@
 # Sentinel AI — FinBERT sentiment analyzer (ProsusAI/finbert, pre-trained)
 # S2-03: load once at startup, batch-analyze headlines, return 7 features + individual_results
+# SentimentBatcher merges concurrent API requests into shared FinBERT batches on a worker thread;
+# SentimentCache means each distinct headline goes through the transformer once.
+
+import asyncio
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
 
 from transformers import pipeline
 import torch
 import numpy as np
 
+FINBERT_MODEL = "ProsusAI/finbert"
+
 _finbert_pipeline = None
+_finbert_lock = threading.Lock()
+
+
+def finbert_backend() -> str:
+    """SENTINEL_FINBERT_BACKEND: "pipeline" (fp32 transformers pipeline, default) or "int8" (see finbert_cpu.py)."""
+    return os.getenv("SENTINEL_FINBERT_BACKEND", "pipeline").strip().lower()
+
+
+def load_fp32_pipeline():
+    """Full-precision transformers pipeline for ProsusAI/finbert. GPU if available."""
+    return pipeline(
+        "sentiment-analysis",
+        model=FINBERT_MODEL,
+        tokenizer=FINBERT_MODEL,
+        device=0 if torch.cuda.is_available() else -1,
+        max_length=512,
+        truncation=True,
+    )
 
 
 def load_finbert():
-    """Download and cache ProsusAI/finbert (~440MB first run). GPU if available."""
+    """Download and cache ProsusAI/finbert (~440MB first run) with the configured backend."""
     global _finbert_pipeline
-    if _finbert_pipeline is None:
-        print("Loading ProsusAI/finbert...")
-        _finbert_pipeline = pipeline(
-            "sentiment-analysis",
-            model="ProsusAI/finbert",
-            tokenizer="ProsusAI/finbert",
-            device=0 if torch.cuda.is_available() else -1,
-            max_length=512,
-            truncation=True,
-        )
+    if _finbert_pipeline is not None:
+        return _finbert_pipeline
+    with _finbert_lock:  # warmup thread and batcher thread must not load it twice
+        if _finbert_pipeline is not None:
+            return _finbert_pipeline
+        if finbert_backend() == "int8":
+            from backend.ml.finbert_cpu import QuantizedFinBERT
+
+            print("Loading ProsusAI/finbert (int8 CPU backend)...")
+            _finbert_pipeline = QuantizedFinBERT()
+        else:
+            print("Loading ProsusAI/finbert...")
+            _finbert_pipeline = load_fp32_pipeline()
         print("finbert loaded successfully")
     return _finbert_pipeline
 
 
-def analyze_headlines_sentiment(headlines: list[str]) -> dict:
+NEUTRAL_SENTIMENT = {
+    "finbert_negative_score": 0.0,
+    "finbert_positive_score": 0.0,
+    "finbert_neutral_score": 1.0,
+    "headline_volume": 0,
+    "headline_escalatory_pct": 0.0,
+    "media_negativity_index": 0.0,
+    "sentiment_trend_7d": 0.0,
+    "dominant_sentiment": "neutral",
+    "individual_results": [],
+}
+
+
+def normalize_headline(text: str) -> str:
+    """Cache key text: whitespace collapsed and lowercased (FinBERT is uncased, so the model sees the same tokens)."""
+    return " ".join(str(text).split()).lower()
+
+
+def headline_key(text: str) -> str:
+    return hashlib.sha256(normalize_headline(text).encode("utf-8")).hexdigest()[:32]
+
+
+class SentimentCache:
     """
-    Batch-analyze headlines with FinBERT. Returns 8 aggregate keys + individual_results.
-    Empty list returns neutral defaults.
+    Content-addressed FinBERT results: sha256(normalized headline) -> {label, score}.
+    An in-memory LRU in front of a SQLite table, so repeated and wire-syndicated headlines are scored once
+    and stay scored across restarts. Rows are tagged with the model so a backend change never serves stale scores.
     """
-    if not headlines:
+
+    def __init__(self, db_path: str | None = None, max_entries: int | None = None, model_tag: str | None = None):
+        if db_path is None:
+            db_path = str(Path(__file__).resolve().parents[2] / "sentinel_sentiment.db")
+        self.db_path = db_path
+        self.max_entries = max_entries or int(os.getenv("SENTINEL_SENTIMENT_CACHE_ENTRIES", "10000"))
+        self.model_tag = model_tag or (FINBERT_MODEL if finbert_backend() == "pipeline" else f"{FINBERT_MODEL}:{finbert_backend()}")
+        self._memory: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS headline_sentiment (
+                    model TEXT NOT NULL,
+                    headline_hash TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    score REAL NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (model, headline_hash)
+                )
+            """)
+            conn.commit()
+
+    def _remember(self, key: str, result: dict) -> None:
+        with self._lock:
+            self._memory[key] = result
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def peek(self, headlines: list[str]) -> list[dict | None]:
+        """Memory-tier lookups only (no I/O, no counters); None where not resident."""
+        return [self._memory.get(headline_key(h)) for h in headlines]
+
+    def get_many(self, headlines: list[str]) -> list[dict | None]:
+        """Cached {label, score} per headline (memory, then SQLite); None for misses."""
+        keys = [headline_key(h) for h in headlines]
+        out: list[dict | None] = []
+        missing = []
+        for key in keys:
+            result = self._memory.get(key)
+            if result is not None:
+                self.memory_hits += 1
+                with self._lock:
+                    self._memory.move_to_end(key)
+            else:
+                missing.append(key)
+            out.append(result)
+        found = {}
+        if missing:
+            unique = list(dict.fromkeys(missing))
+            with sqlite3.connect(self.db_path) as conn:
+                for i in range(0, len(unique), 500):  # stay under SQLite's bound-parameter limit
+                    chunk = unique[i : i + 500]
+                    rows = conn.execute(
+                        f"SELECT headline_hash, label, score FROM headline_sentiment "
+                        f"WHERE model = ? AND headline_hash IN ({','.join('?' * len(chunk))})",
+                        [self.model_tag, *chunk],
+                    ).fetchall()
+                    found.update({key: {"label": label, "score": score} for key, label, score in rows})
+        for i, key in enumerate(keys):
+            if out[i] is None:
+                if key in found:
+                    self.disk_hits += 1
+                    out[i] = found[key]
+                    self._remember(key, found[key])
+                else:
+                    self.misses += 1
+        return out
+
+    def put_many(self, headlines: list[str], results: list[dict]) -> None:
+        rows = {}
+        for h, r in zip(headlines, results):
+            key = headline_key(h)
+            result = {"label": r["label"], "score": float(r["score"])}
+            self._remember(key, result)
+            rows[key] = result
+        now = datetime.utcnow().isoformat() + "Z"
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO headline_sentiment (model, headline_hash, label, score, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(self.model_tag, key, r["label"], r["score"], now) for key, r in rows.items()],
+            )
+            conn.commit()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
         return {
-            "finbert_negative_score": 0.0,
-            "finbert_positive_score": 0.0,
-            "finbert_neutral_score": 1.0,
-            "headline_volume": 0,
-            "headline_escalatory_pct": 0.0,
-            "media_negativity_index": 0.0,
-            "sentiment_trend_7d": 0.0,
-            "dominant_sentiment": "neutral",
-            "individual_results": [],
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
         }
-    pipe = load_finbert()
-    batch_size = 16
-    all_results = []
-    for i in range(0, len(headlines), batch_size):
-        batch = headlines[i : i + batch_size]
-        results = pipe(batch)
-        all_results.extend(results)
+
+
+sentiment_cache = SentimentCache()
+
+
+def classify_headlines(headlines: list[str], batch_size: int = 16, cache: SentimentCache | None = None) -> list[dict]:
+    """
+    Per-headline FinBERT {label, score}, batch_size headlines per forward pass.
+    Headlines already in the cache (default: sentiment_cache) are not sent to the model; duplicates are scored once.
+    """
+    cache = cache if cache is not None else sentiment_cache
+    all_results = cache.get_many(headlines)
+    todo = list(dict.fromkeys(normalize_headline(h) for h, r in zip(headlines, all_results) if r is None))
+    if todo:
+        # One call: the pipeline batches internally; the int8 engine also buckets by token length
+        scored = list(load_finbert()(todo, batch_size=batch_size))
+        cache.put_many(todo, scored)
+        by_text = dict(zip(todo, scored))
+        all_results = [
+            r if r is not None else by_text[normalize_headline(h)]
+            for h, r in zip(headlines, all_results)
+        ]
+    return all_results
+
+
+def aggregate_sentiment(headlines: list[str], all_results: list[dict]) -> dict:
+    """8 aggregate keys + individual_results from per-headline FinBERT results."""
+    if not headlines:
+        return dict(NEUTRAL_SENTIMENT, individual_results=[])
     # Aggregate scores
     neg_scores = [r["score"] for r in all_results if r["label"] == "negative"]
     pos_scores = [r["score"] for r in all_results if r["label"] == "positive"]
@@ -81,6 +250,125 @@ def analyze_headlines_sentiment(headlines: list[str]) -> dict:
     }
 
 
+def analyze_headlines_sentiment(headlines: list[str]) -> dict:
+    """
+    Batch-analyze headlines with FinBERT. Returns 8 aggregate keys + individual_results.
+    Empty list returns neutral defaults. Blocking; async handlers use sentiment_batcher.analyze().
+    """
+    if not headlines:
+        return aggregate_sentiment([], [])
+    return aggregate_sentiment(headlines, classify_headlines(headlines))
+
+
+class SentimentBatcher:
+    """
+    In-process FinBERT inference server: one worker thread drains a request queue and merges the headlines
+    of concurrent requests into one batch, flushed at max_batch headlines or max_wait_ms after the first
+    request arrived. submit() returns a Future of per-headline results; analyze() awaits the aggregate.
+    """
+
+    def __init__(self, max_batch: int | None = None, max_wait_ms: float | None = None):
+        self.max_batch = max_batch or int(os.getenv("SENTINEL_FINBERT_MAX_BATCH", "32"))
+        wait_ms = max_wait_ms if max_wait_ms is not None else float(os.getenv("SENTINEL_FINBERT_MAX_WAIT_MS", "10"))
+        self.max_wait = wait_ms / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.headlines = 0
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="finbert-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, headlines: list[str]) -> Future:
+        """Queue headlines for the next batch; the Future resolves to one {label, score} per headline."""
+        fut: Future = Future()
+        if not headlines:
+            fut.set_result([])
+            return fut
+        cached = sentiment_cache.peek(headlines)
+        if all(r is not None for r in cached):
+            fut.set_result(sentiment_cache.get_many(headlines))  # all in memory: no queue, no batch wait
+            return fut
+        self._ensure_started()
+        self._queue.put((list(headlines), fut))
+        return fut
+
+    async def analyze(self, headlines: list[str]) -> dict:
+        """Async analyze_headlines_sentiment(): same result, computed in a shared batch off the event loop."""
+        if not headlines:
+            return aggregate_sentiment([], [])
+        results = await asyncio.wrap_future(self.submit(headlines))
+        return aggregate_sentiment(headlines, results)
+
+    def close(self) -> None:
+        """Stop the worker after the requests already queued."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            pending = [item]
+            size = len(item[0])
+            deadline = time.monotonic() + self.max_wait
+            stop = False
+            while size < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                pending.append(item)
+                size += len(item[0])
+            self._process(pending)
+            if stop:
+                return
+
+    def _process(self, pending: list[tuple[list[str], Future]]) -> None:
+        pending = [(headlines, fut) for headlines, fut in pending if fut.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        texts = [h for headlines, _ in pending for h in headlines]
+        try:
+            results = classify_headlines(texts, batch_size=self.max_batch)
+        except Exception as e:
+            for _, fut in pending:
+                fut.set_exception(e)
+            return
+        self.requests += len(pending)
+        self.batches += -(-len(texts) // self.max_batch)
+        self.headlines += len(texts)
+        start = 0
+        for headlines, fut in pending:
+            fut.set_result(results[start : start + len(headlines)])
+            start += len(headlines)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "headlines": self.headlines,
+            "mean_batch_size": round(self.headlines / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+
+sentiment_batcher = SentimentBatcher()
+
+
 if __name__ == "__main__":
     test_headlines = [
         "Russia launches missile strikes on Kyiv infrastructure",
@@ -0,0 +1,174 @@
+# Sentinel AI — per-country source files and their fingerprints
+# One place that knows where a country's GDELT / ACLED / UCDP / World Bank inputs live on disk,
+# plus (size, mtime, hash) fingerprints so a refresh can skip countries whose inputs did not change,
+# and a memory-bounded cache of the parsed DataFrames for the API process.
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+
+from backend.ml.columnar import read_source, source_signature
+from backend.ml.registry import content_hash
+
+SOURCES = ("gdelt", "acled", "ucdp", "world_bank")
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[2]
+
+
+def safe_acled_name(acled_name: str) -> str:
+    """Filename stem used by fetch_acled_all_countries (and split_ucdp_global)."""
+    return (
+        acled_name.lower()
+        .replace(" ", "_")
+        .replace("(", "")
+        .replace(")", "")
+        .replace("'", "")
+        .replace("-", "_")
+        .replace("__", "_")
+    )
+
+
+def country_source_paths(code: str, info: dict) -> dict[str, Path | None]:
+    """
+    {source: path or None} for one country, same resolution as the feature pipeline:
+    data/gdelt/{CC}_events.csv, data/acled/{safe}.csv, data/ucdp/{safe}_ged.csv (glob fallback),
+    data/world_bank/{ISO3}.json.
+    """
+    root = _repo_root()
+    data_ucdp = root / "data" / "ucdp"
+    acled_name = info["acled_name"]
+
+    gdelt_path = root / "data" / "gdelt" / f"{code}_events.csv"
+    acled_path = root / "data" / "acled" / f"{safe_acled_name(acled_name)}.csv"
+    safe = acled_name.lower().replace(" ", "_").replace("(", "").replace(")", "").replace("__", "_")
+    ucdp_path = data_ucdp / f"{safe}_ged.csv"
+    if not ucdp_path.exists():
+        # Try alternate (e.g. ukraine vs Ukraine)
+        alt = sorted(data_ucdp.glob(f"*{info['name'].split()[0].lower()}*ged*.csv")) if data_ucdp.exists() else []
+        ucdp_path = alt[0] if alt else None
+    wb_path = root / "data" / "world_bank" / f"{info['iso3']}.json"
+    return {
+        "gdelt": gdelt_path if gdelt_path.exists() else None,
+        "acled": acled_path if acled_path.exists() else None,
+        "ucdp": ucdp_path if ucdp_path is not None and ucdp_path.exists() else None,
+        "world_bank": wb_path if wb_path.exists() else None,
+    }
+
+
+def file_fingerprint(path: Path | None, previous: dict | None = None) -> dict | None:
+    """
+    {"path", "size", "mtime_ns", "sha256"} for a file, or None if it does not exist.
+    The content hash is reused from `previous` when path, size and mtime are unchanged,
+    so steady-state refreshes cost one stat per file.
+    """
+    if path is None:
+        return None
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        return None
+    fp = {"path": str(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if previous and all(previous.get(k) == fp[k] for k in ("path", "size", "mtime_ns")):
+        fp["sha256"] = previous.get("sha256")
+    else:
+        fp["sha256"] = content_hash([Path(path)])
+    return fp
+
+
+def country_fingerprints(code: str, info: dict, previous: dict | None = None) -> dict[str, dict | None]:
+    """{source: fingerprint or None} for every input of one country."""
+    previous = previous or {}
+    paths = country_source_paths(code, info)
+    return {source: file_fingerprint(paths[source], previous.get(source)) for source in SOURCES}
+
+
+def same_inputs(current: dict | None, previous: dict | None) -> bool:
+    """True if both fingerprint sets point at the same files with the same content."""
+    if not current or not previous:
+        return False
+
+    def key(fp):
+        return None if fp is None else (fp.get("path"), fp.get("sha256"))
+
+    return all(key(current.get(s)) == key(previous.get(s)) for s in SOURCES)
+
+
+class DataFrameCache:
+    """
+    In-process cache of parsed source DataFrames keyed by (path, lookback_days), filled via read_source().
+    An entry is invalidated when the CSV's (mtime_ns, size) or its columnar copy changes, and entries are evicted LRU-first
+    once their summed memory_usage(deep=True) exceeds max_bytes. Returned frames are shared:
+    callers must treat them as read-only (the compute_*_features functions copy before mutating).
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[tuple, pd.DataFrame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def read(self, source: str, path: Path, lookback_days: int | None = None) -> pd.DataFrame:
+        """Parsed DataFrame for path (empty DataFrame if the file is missing)."""
+        key = (str(path), lookback_days)
+        try:
+            signature = source_signature(source, path)
+        except FileNotFoundError:
+            self._drop(key)
+            return pd.DataFrame()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] == signature:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.invalidations += 1
+            self.misses += 1
+        df = read_source(source, path, lookback_days=lookback_days)
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            if nbytes <= self.max_bytes:
+                self._entries[key] = (signature, df, nbytes)
+                self._bytes += nbytes
+                while self._bytes > self.max_bytes:
+                    _, (_, _, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+                    self.evictions += 1
+        return df
+
+    def _drop(self, key: tuple) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _cache_budget_bytes() -> int:
+    return int(float(os.getenv("SENTINEL_DF_CACHE_MB", "512")) * 1024 * 1024)
+
+
+dataframe_cache = DataFrameCache(max_bytes=_cache_budget_bytes())
@@ -0,0 +1,29 @@
+# Sentinel AI — shared torch CPU settings
+# torch.set_num_threads is process-global, so the LSTM forecaster and the int8 FinBERT backend share one
+# value, applied once per process, instead of each setting its own.
+
+import os
+import threading
+
+import torch
+
+_lock = threading.Lock()
+_num_threads: int | None = None
+
+
+def torch_num_threads() -> int:
+    """Intra-op threads: SENTINEL_TORCH_THREADS, else min(4, cores) — small CPU inference batches stop scaling past that."""
+    env = os.getenv("SENTINEL_TORCH_THREADS")
+    if env:
+        return max(1, int(env))
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def configure_torch_threads() -> int:
+    """Apply torch_num_threads() on first call; later calls return the value already in effect."""
+    global _num_threads
+    with _lock:
+        if _num_threads is None:
+            _num_threads = torch_num_threads()
+            torch.set_num_threads(_num_threads)
+        return _num_threads
@@ -1,44 +1,282 @@
 # Sentinel AI — PredictionTracker (SQLite logging)
 # S3-01: log predictions, get track record, compute accuracy. See GitHub Issue #21.
+# Writes go through a queue to one background writer (WAL, batched executemany); reads use their own connection.
+# Every refresh logs the full snapshot; feature vectors are stored as packed float32 blobs (FEATURE_SNAPSHOT_FORMAT).
+# Retention tiers: raw rows for SENTINEL_PREDICTIONS_RAW_DAYS, then daily per-country rollups until
+# SENTINEL_PREDICTIONS_DAILY_DAYS, then weekly rollups (kept). Compaction runs a period at a time on the writer.
 
+import atexit
 import json
+import os
+import queue
 import sqlite3
+import threading
+from contextlib import closing
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from backend.ml.feature_store import FEATURE_DTYPE, FeatureStore
+from backend.ml.pipeline import FEATURE_COLUMNS, features_to_matrix
+
 
 def _repo_root() -> Path:
     return Path(__file__).resolve().parents[2]
 
 
+# feature_blob layout: 1 = len(FEATURE_COLUMNS) little-endian float32 in FEATURE_COLUMNS order (188 bytes).
+# Rows with snapshot_format NULL carry the legacy JSON feature_snapshot instead.
+FEATURE_SNAPSHOT_FORMAT = 1
+_BLOB_DTYPE = np.dtype(FEATURE_DTYPE).newbyteorder("<")
+
+RISK_LEVELS = ["LOW", "MODERATE", "ELEVATED", "HIGH", "CRITICAL"]  # risk_scorer.RISK_LABELS order
+
+# Schema migrations, applied in order; PRAGMA user_version records how many have run
+MIGRATIONS: list[list[str]] = [
+    [
+        """
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            country_code TEXT NOT NULL,
+            predicted_at TEXT NOT NULL,
+            risk_level TEXT NOT NULL,
+            risk_score INTEGER NOT NULL,
+            confidence REAL NOT NULL,
+            feature_snapshot TEXT,
+            model_version TEXT,
+            actual_risk_level TEXT,
+            prediction_correct INTEGER
+        )
+        """,
+    ],
+    [
+        "CREATE INDEX IF NOT EXISTS idx_predictions_predicted_at ON predictions (predicted_at)",
+        "CREATE INDEX IF NOT EXISTS idx_predictions_country_time ON predictions (country_code, predicted_at)",
+        "CREATE INDEX IF NOT EXISTS idx_predictions_model_version ON predictions (model_version)",
+        # Covering index over evaluated rows only: every accuracy query below is answered from it
+        """
+        CREATE INDEX IF NOT EXISTS idx_predictions_evaluated ON predictions
+            (predicted_at, prediction_correct, country_code, risk_level, actual_risk_level, confidence)
+            WHERE prediction_correct IS NOT NULL
+        """,
+        "ANALYZE",
+    ],
+    [
+        "ALTER TABLE predictions ADD COLUMN feature_blob BLOB",
+        "ALTER TABLE predictions ADD COLUMN snapshot_format INTEGER",
+        "ALTER TABLE predictions ADD COLUMN source TEXT",  # 'api' (/api/analyze) or 'refresh' (every precompute)
+    ],
+    [
+        "ALTER TABLE predictions ADD COLUMN is_anomaly INTEGER",
+        """
+        CREATE TABLE IF NOT EXISTS prediction_rollups (
+            tier TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            country_code TEXT NOT NULL,
+            n INTEGER NOT NULL,
+            min_score INTEGER NOT NULL,
+            max_score INTEGER NOT NULL,
+            sum_score INTEGER NOT NULL,
+            last_level TEXT,
+            last_at TEXT NOT NULL,
+            anomaly_count INTEGER NOT NULL,
+            evaluated INTEGER NOT NULL,
+            correct INTEGER NOT NULL,
+            PRIMARY KEY (tier, period_start, country_code)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_rollups_country ON prediction_rollups (country_code, period_start)",
+    ],
+    [
+        # Evaluated outcomes per period for the confusion matrix and calibration once raw rows are rolled up
+        """
+        CREATE TABLE IF NOT EXISTS rollup_outcomes (
+            tier TEXT NOT NULL,
+            period_start TEXT NOT NULL,
+            risk_level TEXT NOT NULL,
+            actual_risk_level TEXT NOT NULL,
+            bucket INTEGER NOT NULL,
+            n INTEGER NOT NULL,
+            sum_confidence REAL NOT NULL,
+            correct INTEGER NOT NULL,
+            PRIMARY KEY (tier, period_start, risk_level, actual_risk_level, bucket)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_rollup_outcomes_period ON rollup_outcomes (period_start)",
+    ],
+]
+
+CALIBRATION_BUCKETS = 10  # equal-width confidence buckets over [0, 1], fixed so rollups can store them
+
+# Merging a rollup into an existing row for the same period keeps counts additive and the newest level
+_ROLLUP_UPSERT = """
+    ON CONFLICT (tier, period_start, country_code) DO UPDATE SET
+        n = n + excluded.n,
+        min_score = MIN(min_score, excluded.min_score),
+        max_score = MAX(max_score, excluded.max_score),
+        sum_score = sum_score + excluded.sum_score,
+        last_level = CASE WHEN excluded.last_at > last_at THEN excluded.last_level ELSE last_level END,
+        last_at = MAX(last_at, excluded.last_at),
+        anomaly_count = anomaly_count + excluded.anomaly_count,
+        evaluated = evaluated + excluded.evaluated,
+        correct = correct + excluded.correct
+"""
+
+_OUTCOMES_UPSERT = """
+    ON CONFLICT (tier, period_start, risk_level, actual_risk_level, bucket) DO UPDATE SET
+        n = n + excluded.n,
+        sum_confidence = sum_confidence + excluded.sum_confidence,
+        correct = correct + excluded.correct
+"""
+
+_COMPACT = object()  # writer-queue marker: run one compaction step
+
+
+def retention_days() -> tuple[int, int]:
+    """(raw days, daily-rollup days) from SENTINEL_PREDICTIONS_RAW_DAYS / _DAILY_DAYS (defaults 30, 365)."""
+    raw = int(os.getenv("SENTINEL_PREDICTIONS_RAW_DAYS", "30"))
+    daily = int(os.getenv("SENTINEL_PREDICTIONS_DAILY_DAYS", "365"))
+    return raw, max(daily, raw)
+
+
+def pack_features(row) -> bytes:
+    """One feature vector (FEATURE_COLUMNS order) as a FEATURE_SNAPSHOT_FORMAT blob."""
+    return np.asarray(row, dtype=_BLOB_DTYPE).tobytes()
+
+
+def unpack_features(blob: bytes | None, snapshot_format: int | None = FEATURE_SNAPSHOT_FORMAT, legacy_json: str | None = None) -> dict:
+    """Feature dict back from a logged row (blob, or the legacy JSON snapshot)."""
+    if snapshot_format == FEATURE_SNAPSHOT_FORMAT and blob is not None:
+        return dict(zip(FEATURE_COLUMNS, np.frombuffer(blob, dtype=_BLOB_DTYPE).astype(float).tolist()))
+    return json.loads(legacy_json) if legacy_json else {}
+
+
 class PredictionTracker:
     """
     SQLite-based logging of all predictions for track-record and accuracy.
+    The database runs in WAL mode. log_prediction() only enqueues the row; a background writer thread
+    owns a persistent write connection and flushes the queue with executemany, one transaction per batch.
+    Readers use their own persistent read connection, so they never wait on (or block) the writer.
+    Rows older than the raw retention are folded into daily, then weekly, per-country rollups by
+    request_compaction(); accuracy, confusion, calibration and history queries read across the tiers. Keep the raw retention longer
+    than the time it takes to fill in actual_risk_level, since rolled-up rows can no longer be evaluated.
     """
 
-    def __init__(self, db_path: str | None = None):
+    def __init__(self, db_path: str | None = None, batch_size: int = 1000):
         if db_path is None:
             db_path = str(_repo_root() / "sentinel_predictions.db")
         self.db_path = db_path
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        self._read_conn: sqlite3.Connection | None = None
+        self._read_lock = threading.Lock()
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.compacted_periods = 0
+        self._compaction_queued = False
         self._init_db()
+        atexit.register(self.close)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # durable at WAL checkpoints; safe against corruption
+        return conn
 
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS predictions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    country_code TEXT NOT NULL,
-                    predicted_at TEXT NOT NULL,
-                    risk_level TEXT NOT NULL,
-                    risk_score INTEGER NOT NULL,
-                    confidence REAL NOT NULL,
-                    feature_snapshot TEXT,
-                    model_version TEXT,
-                    actual_risk_level TEXT,
-                    prediction_correct INTEGER
+        """
+        Apply any MIGRATIONS newer than the file's PRAGMA user_version, each in its own explicit transaction
+        (sqlite3 would otherwise autocommit DDL), so a crash mid-migration leaves the previous version intact.
+        """
+        with closing(self._connect()) as conn:
+            conn.isolation_level = None  # manual BEGIN/COMMIT
+            while True:
+                conn.execute("BEGIN IMMEDIATE")  # also serializes processes starting at the same time
+                try:
+                    version = conn.execute("PRAGMA user_version").fetchone()[0]
+                    if version >= len(MIGRATIONS):
+                        conn.execute("COMMIT")
+                        break
+                    for sql in MIGRATIONS[version]:
+                        conn.execute(sql)
+                    conn.execute(f"PRAGMA user_version = {version + 1}")
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            self.schema_version = version
+
+    def _reader(self) -> sqlite3.Connection:
+        """Persistent read connection (callers hold _read_lock)."""
+        if self._read_conn is None:
+            self._read_conn = self._connect()
+            self._read_conn.execute("PRAGMA query_only = ON")
+        return self._read_conn
+
+    def _ensure_writer(self) -> None:
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="tracker-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                batch, markers, stop, compact = [], [], False, False
+                while True:
+                    if item is None:
+                        stop = True
+                    elif item is _COMPACT:
+                        compact = True
+                    elif isinstance(item, threading.Event):
+                        markers.append(item)
+                    elif isinstance(item, list):
+                        batch.extend(item)  # log_snapshot: a whole refresh, kept in one transaction
+                    else:
+                        batch.append(item)
+                    if stop or len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write_batch(conn, batch)
+                if compact:
+                    self._compaction_queued = False
+                    # One period per step; requeue behind pending writes while older periods remain
+                    if self._compact_step(conn) and not stop:
+                        self.request_compaction()
+                for marker in markers:
+                    marker.set()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list[tuple]) -> None:
+        try:
+            with conn:  # one transaction per batch
+                conn.executemany(
+                    """
+                    INSERT INTO predictions
+                    (country_code, predicted_at, risk_level, risk_score, confidence,
+                     feature_blob, snapshot_format, model_version, source, is_anomaly)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
                 )
-            """)
-            conn.commit()
+            self.written += len(rows)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"  Warning: prediction log dropped {len(rows)} rows: {e}")
 
     def log_prediction(
         self,
@@ -46,33 +284,197 @@ class PredictionTracker:
         prediction: dict,
         features: dict,
         model_version: str = "2.0.0",
+        is_anomaly: bool | None = None,
     ) -> None:
-        """Insert one prediction into SQLite."""
+        """Queue one prediction for the background writer (returns immediately)."""
         predicted_at = datetime.utcnow().isoformat() + "Z"
         risk_level = prediction.get("risk_level", "")
         risk_score = int(prediction.get("risk_score", 0))
         confidence = float(prediction.get("confidence", 0))
-        feature_snapshot = json.dumps(features) if features else "{}"
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT INTO predictions
-                (country_code, predicted_at, risk_level, risk_score, confidence,
-                 feature_snapshot, model_version, actual_risk_level, prediction_correct)
-                VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)
-                """,
-                (country_code, predicted_at, risk_level, risk_score, confidence, feature_snapshot, model_version),
-            )
-            conn.commit()
+        blob = pack_features(features_to_matrix([features or {}])[0])
+        self._ensure_writer()
+        self._queue.put(
+            (country_code, predicted_at, risk_level, risk_score, confidence,
+             blob, FEATURE_SNAPSHOT_FORMAT, model_version, "api", None if is_anomaly is None else int(is_anomaly))
+        )
+
+    def log_snapshot(self, scores: dict[str, dict], store: FeatureStore, model_version: str = "2.0.0") -> int:
+        """
+        Queue every country of a refresh (scores as built by refresh.score_countries) as one bulk write.
+        Feature blobs are sliced straight from the store's float32 matrix. Returns the number of rows queued.
+        """
+        predicted_at = datetime.utcnow().isoformat() + "Z"
+        codes = [code for code in scores if code in store]
+        matrix = store.rows(codes).astype(_BLOB_DTYPE, copy=False)
+        rows = []
+        for code, vector in zip(codes, matrix):
+            pred = scores[code].get("risk_prediction") or {}
+            rows.append((
+                code,
+                predicted_at,
+                scores[code]["riskLevel"],
+                int(scores[code]["riskScore"]),
+                float(pred.get("confidence", 0)),
+                vector.tobytes(),
+                FEATURE_SNAPSHOT_FORMAT,
+                model_version,
+                "refresh",
+                int(bool(scores[code].get("isAnomaly"))),
+            ))
+        if rows:
+            self._ensure_writer()
+            self._queue.put(rows)
+        return len(rows)
+
+    def request_compaction(self) -> None:
+        """Queue incremental compaction on the writer thread (no-op if a step is already queued)."""
+        if self._compaction_queued:
+            return
+        self._compaction_queued = True
+        self._ensure_writer()
+        self._queue.put(_COMPACT)
 
-    def get_track_record(self, limit: int = 20) -> list[dict]:
-        """Return recent predictions for UI (newest first)."""
-        with sqlite3.connect(self.db_path) as conn:
+    def _compact_step(self, conn: sqlite3.Connection) -> bool:
+        """
+        Fold the oldest expired raw day into daily rollups, else the oldest expired week of daily rollups into
+        a weekly rollup; each in one transaction that also deletes the source rows. True if a period was compacted.
+        """
+        raw_days, daily_days = retention_days()
+        today = datetime.utcnow().date()
+        raw_cutoff = (today - timedelta(days=raw_days)).isoformat()
+        daily_cutoff = (today - timedelta(days=daily_days)).isoformat()
+        try:
+            (oldest,) = conn.execute(
+                "SELECT substr(MIN(predicted_at), 1, 10) FROM predictions WHERE predicted_at < ?", (raw_cutoff,)
+            ).fetchone()
+            if oldest is not None:
+                start, end = oldest, (datetime.fromisoformat(oldest) + timedelta(days=1)).date().isoformat()
+                with conn:
+                    conn.execute(
+                        """
+                        INSERT INTO prediction_rollups
+                        (tier, period_start, country_code, n, min_score, max_score, sum_score,
+                         last_level, last_at, anomaly_count, evaluated, correct)
+                        SELECT 'daily', ?, country_code, COUNT(*), MIN(risk_score), MAX(risk_score), SUM(risk_score),
+                               (SELECT l.risk_level FROM predictions l
+                                WHERE l.country_code = p.country_code AND l.predicted_at >= ? AND l.predicted_at < ?
+                                ORDER BY l.predicted_at DESC LIMIT 1),
+                               MAX(predicted_at), COALESCE(SUM(is_anomaly), 0),
+                               COUNT(prediction_correct), COALESCE(SUM(prediction_correct = 1), 0)
+                        FROM predictions p
+                        WHERE predicted_at >= ? AND predicted_at < ?
+                        GROUP BY country_code
+                        """ + _ROLLUP_UPSERT,
+                        (start, start, end, start, end),
+                    )
+                    conn.execute(
+                        """
+                        INSERT INTO rollup_outcomes
+                        (tier, period_start, risk_level, actual_risk_level, bucket, n, sum_confidence, correct)
+                        SELECT 'daily', ?, risk_level, actual_risk_level, MIN(CAST(confidence * ? AS INTEGER), ? - 1) AS bucket,
+                               COUNT(*), SUM(confidence), SUM(prediction_correct = 1)
+                        FROM predictions
+                        WHERE predicted_at >= ? AND predicted_at < ? AND prediction_correct IS NOT NULL
+                        GROUP BY risk_level, actual_risk_level, bucket
+                        """ + _OUTCOMES_UPSERT,
+                        (start, CALIBRATION_BUCKETS, CALIBRATION_BUCKETS, start, end),
+                    )
+                    conn.execute("DELETE FROM predictions WHERE predicted_at >= ? AND predicted_at < ?", (start, end))
+                self.compacted_periods += 1
+                return True
+
+            (oldest,) = conn.execute(
+                "SELECT MIN(period_start) FROM prediction_rollups WHERE tier = 'daily' AND period_start < ?",
+                (daily_cutoff,),
+            ).fetchone()
+            if oldest is None:
+                return False
+            day = datetime.fromisoformat(oldest).date()
+            week = day - timedelta(days=day.weekday())  # ISO weeks start on Monday
+            start, end = week.isoformat(), (week + timedelta(days=7)).isoformat()
+            if end > daily_cutoff:
+                return False  # the oldest week still has days inside the daily tier
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO prediction_rollups
+                    (tier, period_start, country_code, n, min_score, max_score, sum_score,
+                     last_level, last_at, anomaly_count, evaluated, correct)
+                    SELECT 'weekly', ?, country_code, SUM(n), MIN(min_score), MAX(max_score), SUM(sum_score),
+                           (SELECT l.last_level FROM prediction_rollups l
+                            WHERE l.tier = 'daily' AND l.country_code = r.country_code
+                              AND l.period_start >= ? AND l.period_start < ?
+                            ORDER BY l.last_at DESC LIMIT 1),
+                           MAX(last_at), SUM(anomaly_count), SUM(evaluated), SUM(correct)
+                    FROM prediction_rollups r
+                    WHERE tier = 'daily' AND period_start >= ? AND period_start < ?
+                    GROUP BY country_code
+                    """ + _ROLLUP_UPSERT,
+                    (start, start, end, start, end),
+                )
+                conn.execute(
+                    """
+                    INSERT INTO rollup_outcomes
+                    (tier, period_start, risk_level, actual_risk_level, bucket, n, sum_confidence, correct)
+                    SELECT 'weekly', ?, risk_level, actual_risk_level, bucket, SUM(n), SUM(sum_confidence), SUM(correct)
+                    FROM rollup_outcomes
+                    WHERE tier = 'daily' AND period_start >= ? AND period_start < ?
+                    GROUP BY risk_level, actual_risk_level, bucket
+                    """ + _OUTCOMES_UPSERT,
+                    (start, start, end),
+                )
+                for table in ("prediction_rollups", "rollup_outcomes"):
+                    conn.execute(
+                        f"DELETE FROM {table} WHERE tier = 'daily' AND period_start >= ? AND period_start < ?",
+                        (start, end),
+                    )
+            self.compacted_periods += 1
+            return True
+        except sqlite3.Error as e:
+            self.errors += 1
+            print(f"  Warning: prediction log compaction failed: {e}")
+            return False
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until everything queued so far is committed; False on timeout."""
+        if self._writer is None or not self._writer.is_alive():
+            return True
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self) -> None:
+        """Flush and stop the writer, then close the read connection."""
+        with self._writer_lock:
+            writer = self._writer
+            self._writer = None
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join(timeout=10)
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "errors": self.errors,
+            "compacted_periods": self.compacted_periods,
+        }
+
+    def get_track_record(self, limit: int = 20, include_features: bool = False) -> list[dict]:
+        """Return recent predictions for UI (newest first); include_features adds each row's logged feature dict."""
+        snapshot_columns = ", feature_blob, snapshot_format, feature_snapshot" if include_features else ""
+        with self._read_lock:
+            conn = self._reader()
             conn.row_factory = sqlite3.Row
             cur = conn.execute(
-                """
+                f"""
                 SELECT country_code, predicted_at, risk_level, risk_score, confidence,
-                       model_version, actual_risk_level, prediction_correct
+                       model_version, actual_risk_level, prediction_correct{snapshot_columns}
                 FROM predictions
                 ORDER BY predicted_at DESC
                 LIMIT ?
@@ -80,32 +482,163 @@ class PredictionTracker:
                 (limit,),
             )
             rows = cur.fetchall()
-        return [dict(row) for row in rows]
+        records = []
+        for row in rows:
+            record = dict(row)
+            if include_features:
+                record["features"] = unpack_features(
+                    record.pop("feature_blob"), record.pop("snapshot_format"), record.pop("feature_snapshot")
+                )
+            records.append(record)
+        return records
+
+    @staticmethod
+    def _since(days_back: int) -> str:
+        return (datetime.utcnow() - timedelta(days=days_back)).isoformat() + "Z"
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            conn = self._reader()
+            conn.row_factory = None
+            return conn.execute(sql, params).fetchall()
 
     def compute_accuracy(self, days_back: int = 90) -> dict:
         """Calculate accuracy metrics over the last N days (where prediction_correct is set)."""
-        since = (datetime.utcnow() - timedelta(days=days_back)).isoformat() + "Z"
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(
-                """
-                SELECT prediction_correct FROM predictions
+        since = self._since(days_back)
+        (total, correct), = self._query(
+            """
+            SELECT COALESCE(SUM(t), 0), COALESCE(SUM(c), 0) FROM (
+                SELECT COUNT(*) AS t, SUM(prediction_correct = 1) AS c FROM predictions
                 WHERE predicted_at >= ? AND prediction_correct IS NOT NULL
-                """,
-                (since,),
+                UNION ALL
+                SELECT SUM(evaluated), SUM(correct) FROM prediction_rollups WHERE period_start >= ?
             )
-            rows = cur.fetchall()
-        if not rows:
-            return {
-                "total_evaluated": 0,
-                "correct": 0,
-                "accuracy_pct": 0.0,
-                "days_back": days_back,
-            }
-        total = len(rows)
-        correct = sum(1 for (r,) in rows if r == 1)
+            """,
+            (since, since[:10]),
+        )
         return {
             "total_evaluated": total,
             "correct": correct,
             "accuracy_pct": round(100.0 * correct / total, 1) if total else 0.0,
             "days_back": days_back,
         }
+
+    def accuracy_by_country(self, days_back: int = 90) -> dict[str, dict]:
+        """{country_code: {total_evaluated, correct, accuracy_pct}} over the last N days."""
+        since = self._since(days_back)
+        rows = self._query(
+            """
+            SELECT country_code, SUM(t), SUM(c) FROM (
+                SELECT country_code, COUNT(*) AS t, SUM(prediction_correct = 1) AS c FROM predictions
+                WHERE predicted_at >= ? AND prediction_correct IS NOT NULL
+                GROUP BY country_code
+                UNION ALL
+                SELECT country_code, SUM(evaluated), SUM(correct) FROM prediction_rollups
+                WHERE period_start >= ? AND evaluated > 0
+                GROUP BY country_code
+            )
+            GROUP BY country_code
+            """,
+            (since, since[:10]),
+        )
+        return {
+            code: {"total_evaluated": total, "correct": correct, "accuracy_pct": round(100.0 * correct / total, 1)}
+            for code, total, correct in rows
+        }
+
+    def confusion_matrix(self, days_back: int = 90) -> dict:
+        """Predicted x actual risk-level counts over the last N days (raw rows + rollups); matrix[i][j] = predicted i, actual j."""
+        since = self._since(days_back)
+        rows = self._query(
+            """
+            SELECT risk_level, actual_risk_level, SUM(n) FROM (
+                SELECT risk_level, actual_risk_level, COUNT(*) AS n FROM predictions
+                WHERE predicted_at >= ? AND prediction_correct IS NOT NULL
+                GROUP BY risk_level, actual_risk_level
+                UNION ALL
+                SELECT risk_level, actual_risk_level, SUM(n) FROM rollup_outcomes
+                WHERE period_start >= ?
+                GROUP BY risk_level, actual_risk_level
+            )
+            GROUP BY risk_level, actual_risk_level
+            """,
+            (since, since[:10]),
+        )
+        index = {level: i for i, level in enumerate(RISK_LEVELS)}
+        matrix = [[0] * len(RISK_LEVELS) for _ in RISK_LEVELS]
+        for predicted, actual, count in rows:
+            if predicted in index and actual in index:
+                matrix[index[predicted]][index[actual]] += count
+        return {"levels": RISK_LEVELS, "matrix": matrix, "days_back": days_back}
+
+    def calibration(self, days_back: int = 90) -> list[dict]:
+        """Mean confidence vs observed accuracy per CALIBRATION_BUCKETS confidence bucket (raw rows + rollups)."""
+        since = self._since(days_back)
+        buckets = CALIBRATION_BUCKETS
+        rows = self._query(
+            """
+            SELECT bucket, SUM(n), SUM(sum_confidence) / SUM(n), 1.0 * SUM(correct) / SUM(n) FROM (
+                SELECT MIN(CAST(confidence * ? AS INTEGER), ? - 1) AS bucket,
+                       COUNT(*) AS n, SUM(confidence) AS sum_confidence, SUM(prediction_correct = 1) AS correct
+                FROM predictions
+                WHERE predicted_at >= ? AND prediction_correct IS NOT NULL
+                GROUP BY bucket
+                UNION ALL
+                SELECT bucket, SUM(n), SUM(sum_confidence), SUM(correct) FROM rollup_outcomes
+                WHERE period_start >= ?
+                GROUP BY bucket
+            )
+            GROUP BY bucket ORDER BY bucket
+            """,
+            (buckets, buckets, since, since[:10]),
+        )
+        return [
+            {
+                "bucket": f"{b / buckets:.1f}-{(b + 1) / buckets:.1f}",
+                "count": count,
+                "mean_confidence": round(mean_conf, 4),
+                "accuracy": round(acc, 4),
+            }
+            for b, count, mean_conf, acc in rows
+        ]
+
+    def history(self, country_code: str, days: int = 365) -> list[dict]:
+        """
+        One country's score history, oldest first, read from whichever tier holds each period:
+        raw rows grouped per day, then daily and weekly rollups. Each point has the same shape.
+        """
+        since = self._since(days)
+        rows = self._query(
+            """
+            SELECT 'weekly', period_start, n, min_score, max_score, sum_score, last_level, anomaly_count
+            FROM prediction_rollups WHERE tier = 'weekly' AND country_code = ? AND period_start >= ?
+            UNION ALL
+            SELECT 'daily', period_start, n, min_score, max_score, sum_score, last_level, anomaly_count
+            FROM prediction_rollups WHERE tier = 'daily' AND country_code = ? AND period_start >= ?
+            UNION ALL
+            SELECT 'raw', substr(predicted_at, 1, 10) AS day, COUNT(*), MIN(risk_score), MAX(risk_score),
+                   SUM(risk_score),
+                   (SELECT l.risk_level FROM predictions l
+                    WHERE l.country_code = p.country_code AND l.predicted_at >= substr(p.predicted_at, 1, 10)
+                      AND l.predicted_at < date(substr(p.predicted_at, 1, 10), '+1 day')
+                    ORDER BY l.predicted_at DESC LIMIT 1),
+                   COALESCE(SUM(is_anomaly), 0)
+            FROM predictions p WHERE country_code = ? AND predicted_at >= ?
+            GROUP BY day
+            ORDER BY 2
+            """,
+            (country_code, since[:10], country_code, since[:10], country_code, since),
+        )
+        return [
+            {
+                "tier": tier,
+                "periodStart": period,
+                "count": n,
+                "minScore": lo,
+                "maxScore": hi,
+                "meanScore": round(total / n, 2) if n else 0.0,
+                "lastLevel": level,
+                "anomalyCount": anomalies,
+            }
+            for tier, period, n, lo, hi, total, level, anomalies in rows
+        ]
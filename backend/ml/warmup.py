@@ -0,0 +1,119 @@
+# Sentinel AI — background model warmup
+# After the server starts accepting traffic, the models the API process itself runs (FinBERT, risk scorer)
+# are loaded and warmed on background threads. Anomaly and forecast models only run in the scoring worker,
+# which warms them in its initializer and reports their state in the refresh metadata. Each model gets one shared readiness future: requests that need a model await it
+# instead of triggering (or duplicating) the load themselves. /ready reports the per-model state.
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from backend.ml.risk_scorer import load_risk_scorer, predict_risk
+from backend.ml.sentiment import load_finbert
+
+
+class ModelWarmup:
+    """
+    Named warmup tasks with readiness futures and load timings.
+    A failed load is retried (at most every retry_after seconds) by the next wait() or retry_failed().
+    """
+
+    def __init__(self, max_workers: int = 2, retry_after: float = 30.0):
+        self._executor: ThreadPoolExecutor | None = None
+        self._max_workers = max_workers
+        self.retry_after = retry_after
+        self._futures: dict[str, Future] = {}
+        self._loaders: dict[str, Callable[[], Any]] = {}
+        self._failed_at: dict[str, float] = {}
+        self._state: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def start(self, name: str, load: Callable[[], Any]) -> Future:
+        """Run load() on the warmup pool (once per name, again after a failure) and return its readiness future."""
+        with self._lock:
+            if name in self._futures:
+                failed_at = self._failed_at.get(name)
+                if failed_at is None or time.monotonic() - failed_at < self.retry_after:
+                    return self._futures[name]
+                del self._failed_at[name]
+            self._loaders[name] = load
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="warmup")
+            self._state[name] = {"state": "pending", "seconds": None, "error": None}
+            fut = self._executor.submit(self._run, name, load)
+            self._futures[name] = fut
+            return fut
+
+    def _run(self, name: str, load: Callable[[], Any]) -> Any:
+        self._state[name]["state"] = "loading"
+        t0 = time.perf_counter()
+        try:
+            result = load()
+        except Exception as e:
+            self._state[name].update(state="failed", seconds=round(time.perf_counter() - t0, 3), error=str(e))
+            self._failed_at[name] = time.monotonic()
+            print(f"  Warmup {name} failed after {time.perf_counter() - t0:.1f}s: {e}")
+            raise
+        seconds = time.perf_counter() - t0
+        self._state[name].update(state="ready", seconds=round(seconds, 3))
+        print(f"  Warmup {name} ready in {seconds:.1f}s")
+        return result
+
+    async def wait(self, name: str) -> bool:
+        """Await a model's readiness; True if it loaded, False if it failed (a retry is scheduled) or was never started."""
+        fut = self._futures.get(name)
+        if fut is None:
+            return False
+        try:
+            await asyncio.shield(asyncio.wrap_future(fut))
+        except Exception:
+            self.start(name, self._loaders[name])  # no-op until retry_after has passed
+            return False
+        return True
+
+    def retry_failed(self) -> None:
+        """Restart every failed load whose retry_after has passed."""
+        for name, load in list(self._loaders.items()):
+            if name in self._failed_at:
+                self.start(name, load)
+
+    def is_ready(self) -> bool:
+        """Every model loaded; a pending, loading or failed model is not ready."""
+        return all(s["state"] == "ready" for s in self._state.values())
+
+    def report(self) -> dict:
+        return {name: dict(state) for name, state in self._state.items()}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _warm_finbert() -> None:
+    # First forward pass allocates the activation buffers; run it here, not in a user request
+    load_finbert()(["Markets steady ahead of ceasefire talks"], batch_size=1)
+
+
+def _warm_risk_scorer() -> None:
+    load_risk_scorer()
+    predict_risk({})
+
+
+# Load order: FinBERT first (largest, needed by /api/analyze and /api/risk-score)
+MODEL_LOADERS: dict[str, Callable[[], Any]] = {
+    "finbert": _warm_finbert,
+    "risk_scorer": _warm_risk_scorer,
+}
+
+
+model_warmup = ModelWarmup()
+
+
+def start_warmup(warmup: ModelWarmup | None = None) -> ModelWarmup:
+    """Kick off background loading of every model in MODEL_LOADERS; returns immediately."""
+    warmup = warmup or model_warmup
+    for name, load in MODEL_LOADERS.items():
+        warmup.start(name, load)
+    return warmup
@@ -2,6 +2,7 @@ import type {
   DashboardSummary,
   AnalyzeResult,
   ForecastResult,
+  CountryForecast,
   AnomalyResult,
 } from "./types";
 
@@ -38,6 +39,9 @@ export const api = {
       body: JSON.stringify({ country, countryCode }),
     }),
 
+  getForecasts: () =>
+    fetchJSON<CountryForecast[]>("/api/forecasts"),
+
   getAnomalies: () =>
     fetchJSON<AnomalyResult[]>("/api/anomalies"),
 
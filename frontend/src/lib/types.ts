@@ -100,6 +100,12 @@ export interface ForecastResult {
   trend: "ESCALATING" | "STABLE" | "DE-ESCALATING";
 }
 
+// Bulk forecasts from /api/forecasts (pre-computed each refresh)
+export interface CountryForecast extends ForecastResult {
+  countryCode: string;
+  country: string;
+}
+
 // Anomaly from /api/anomalies
 export interface AnomalyResult {
   countryCode: string;